@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import monitors
+from module import storage
+from module import blobs
+
+def make_config(store_path, atom_nums):
+    config = {'driver_path' : './chromedriver', 'atom_nums' : atom_nums, 'default_interval' : 3600.0, 'max_snapshots' : 10, \
+              'store_path' : store_path, 'port' : 0, 'ip' : '127.0.0.1', 'user_agent' : None, 'line_notify_token' : '', \
+              'line_notify_url' : 'https://notify-api.line.me/api/notify', \
+              'fetch_workers' : 1, 'max_browsers' : atom_nums, 'driver_pool_size' : 1, 'driver_max_pages' : 50, \
+              'driver_idle_timeout' : 60.0, 'schedule_jitter' : 0.1, 'save_batch_size' : 100, 'save_flush_interval' : 1.0, \
+              'compact_interval' : 600.0, 'blob_collect_interval' : 0, 'startup_spread' : 300.0, 'fetch_mode' : 'browser', 'http_timeout' : 30.0, 'browser_extract' : False, \
+              'overview_page_size' : 100, 'preview_page_size' : 262144, 'diff_page_size' : 200, \
+              'notify_workers' : 2, 'notify_queue_size' : 1000, 'notify_timeout' : 10.0, 'notify_retries' : 3, 'notify_backoff' : 1.0, \
+              'smtp_host' : 'localhost', 'smtp_port' : 25, 'smtp_user' : '', 'smtp_password' : '', 'smtp_sender' : 'seleniumonitor@localhost', \
+              'notify_window' : 30.0, 'notify_rate' : 10.0, 'notify_burst' : 20, 'metrics_tags' : [], 'timing_history' : 50, \
+              'rebalance_interval' : 0, 'rebalance_threshold' : 0.2, 'rebalance_moves' : 20, 'import_batch_size' : 500, \
+              'domain_concurrency' : 2, 'domain_spacing' : 0.5, 'domain_slots' : 4096, \
+              'adaptive_factor' : 4.0, 'adaptive_min_interval' : 60.0, 'adaptive_max_interval' : 86400.0, \
+              'fetch_profile' : 'light', 'blocked_urls' : [], 'page_load_strategy' : 'eager', 'page_load_timeout' : 30.0, 'wait_timeout' : 10.0, \
+              'check_timeout' : 120.0, 'failure_backoff_max' : 3600.0, 'breaker_threshold' : 5, 'breaker_cooldown' : 300.0, 'supervise_interval' : 0}
+    config['atoms_path'] = os.path.join(store_path, 'atoms/')
+    config['global_setting_path'] = os.path.join(store_path, 'global_setting')
+    config['blobs_path'] = os.path.join(store_path, 'blobs')
+    for dir_path in [config['atoms_path'], config['global_setting_path'], config['blobs_path']]:
+        os.makedirs(dir_path, exist_ok=True)
+    return config
+
+def populate(config, watches, snapshots, tags=10):
+    blob_store = blobs.BlobStore(config['blobs_path'])
+    atom_stores = [storage.AtomStore(os.path.join(config['atoms_path'], 'atom_' + str(atom_index) + '.sqlite')) for atom_index in range(config['atom_nums'])]
+    for index in range(watches):
+        web_container = monitors.WebContainer(config, 'http://127.0.0.1/' + str(index), config['default_interval'])
+        web_container.id = str(index)
+        web_container.setting.set_tags(['tag' + str(index % tags)])
+        for snapshot in range(snapshots):
+            web_container.history.append(monitors.PageData.from_record(blob_store, ('%032x' % snapshot, time.time(), int(snapshot > 0), None, None)))
+
+        atom_store = atom_stores[index % len(atom_stores)]
+        atom_store.save_container(web_container)
+        atom_store.save_history(web_container)
+    for atom_store in atom_stores:
+        atom_store.commit()
+        atom_store.close()
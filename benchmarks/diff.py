@@ -0,0 +1,51 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import blobs
+from module import differ
+
+def make_text(lines):
+    return '\n'.join(['post %d %s' % (index, 'lorem ipsum ' * 10) for index in range(lines)])
+
+def change_text(text, ratio):
+    lines = text.splitlines()
+    for index in random.sample(range(len(lines)), max(1, int(len(lines) * ratio))):
+        lines[index] = lines[index].replace('lorem', 'changed', 1)
+    return '\n'.join(lines)
+
+def bench(label, function, repeat):
+    start_time = time.time()
+    for _ in range(repeat):
+        result = function()
+    print('%-28s %8.2f ms' % (label, (time.time() - start_time) / repeat * 1000))
+    return result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=20000)
+    parser.add_argument('--ratio', type=float, default=0.01)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    previous_text = make_text(args.lines)
+    latest_text = change_text(previous_text, args.ratio)
+    print('text size: %.1f MB, %d lines changed' % (len(latest_text) / 1024 / 1024, int(args.lines * args.ratio)))
+
+    blob_store = blobs.BlobStore(tempfile.mkdtemp())
+    previous_ref, latest_ref = blob_store.put(previous_text), blob_store.put(latest_text)
+    diff = bench('make_diff', lambda: differ.make_diff(previous_text, latest_text), args.repeat)
+    print('%-28s %8.1f KB vs %.1f KB of page text' % ('stored hunks', len(json.dumps(diff)) / 1024, (len(previous_text) + len(latest_text)) / 1024))
+
+    blob_store.put(json.dumps(diff), differ.diff_key(previous_ref, latest_ref))
+    bench('load stored diff', lambda: differ.load_diff.__wrapped__(blob_store.path, previous_ref, latest_ref), args.repeat)
+    differ.load_diff(blob_store.path, previous_ref, latest_ref)
+    bench('load cached diff', lambda: differ.load_diff(blob_store.path, previous_ref, latest_ref), args.repeat)
+
+if __name__ == '__main__':
+    main()
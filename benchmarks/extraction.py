@@ -0,0 +1,41 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inscriptis import get_text
+from module import extractors
+
+def make_page(rows):
+    body = ['<div class="nav">' + ''.join(['<a href="/%d">link %d</a>' % (index, index) for index in range(200)]) + '</div>']
+    body.append('<div class="ad">rotating ad %d</div>' % random.randint(0, 1000))
+    body.append('<table id="prices">' + ''.join(['<tr><td>item %d</td><td>%d</td></tr>' % (index, index * 7) for index in range(100)]) + '</table>')
+    body.append('<div class="feed">' + ''.join(['<p>post %d %s</p>' % (index, 'lorem ipsum ' * 20) for index in range(rows)]) + '</div>')
+    body.append('<footer>Last updated %s</footer>' % time.ctime())
+    return '<html><body>' + ''.join(body) + '</body></html>'
+
+def bench(label, function, html, repeat):
+    start_time = time.time()
+    for _ in range(repeat):
+        function(html)
+    print('%-28s %8.2f ms/page' % (label, (time.time() - start_time) / repeat * 1000))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    html = make_page(args.rows)
+    print('page size: %.1f MB' % (len(html) / 1024 / 1024))
+
+    bench('full page get_text', get_text, html, args.repeat)
+    full_page = extractors.get_extractor('', '.ad, .nav', ('/Last updated .*/', ))
+    bench('full page with ignores', lambda html: full_page.filter(full_page.extract(html)), html, args.repeat)
+    selected = extractors.get_extractor('#prices', '', ())
+    bench('css selector #prices', lambda html: selected.filter(selected.extract(html)), html, args.repeat)
+
+if __name__ == '__main__':
+    main()
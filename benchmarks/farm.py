@@ -0,0 +1,119 @@
+import time
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class SiteFarm():
+    # synthetic pages on one local server, /page/<index> for watches and /notify standing in for LINE Notify
+    def __init__(self, page_size=20000, change_rate=0.1, change_period=60.0, js_weight=0, host='127.0.0.1', port=0):
+        self.page_size = page_size
+        self.change_rate = change_rate
+        self.change_period = change_period
+        self.js_weight = js_weight
+        self.requests = 0
+        self.not_modified = 0
+        self.notifications = 0
+        self.lock = threading.Lock()
+
+        farm = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                farm.serve_page(self)
+
+            def do_POST(self):
+                farm.serve_notify(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def url(self, index):
+        host, port = self.server.server_address
+        return 'http://%s:%d/page/%d' % (host, port, index)
+
+    def notify_url(self):
+        host, port = self.server.server_address
+        return 'http://%s:%d/notify' % (host, port)
+
+    def version(self, index):
+        # a change_rate share of the pages gets new content every change_period
+        if int(hashlib.md5(str(index).encode()).hexdigest()[ : 8], 16) / 0xffffffff < self.change_rate:
+            return int(time.time() // self.change_period)
+        return 0
+
+    def make_page(self, index, version):
+        line = '<p>page %d version %d lorem ipsum dolor sit amet</p>\n' % (index, version)
+        body = line * max(1, self.page_size // len(line))
+        # js_weight milliseconds of busy script before the page settles
+        script = '<script>var start = Date.now(); while (Date.now() - start < %d) {}</script>' % (self.js_weight) if self.js_weight else ''
+        return '<html><head><title>page %d</title>%s</head><body>%s</body></html>' % (index, script, body)
+
+    def serve_page(self, handler):
+        parts = handler.path.split('/')
+        if len(parts) != 3 or parts[1] != 'page' or not parts[2].isdigit():
+            handler.send_error(404)
+            return
+
+        index = int(parts[2])
+        page = self.make_page(index, self.version(index)).encode('utf8')
+        etag = '"%s"' % (hashlib.md5(page).hexdigest())
+        with self.lock:
+            self.requests += 1
+            if handler.headers.get('If-None-Match') == etag:
+                self.not_modified += 1
+
+        if handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.end_headers()
+            return
+
+        handler.send_response(200)
+        handler.send_header('Content-Type', 'text/html; charset=utf-8')
+        handler.send_header('Content-Length', str(len(page)))
+        handler.send_header('ETag', etag)
+        handler.end_headers()
+        handler.wfile.write(page)
+
+    def serve_notify(self, handler):
+        handler.rfile.read(int(handler.headers.get('Content-Length', 0)))
+        with self.lock:
+            self.notifications += 1
+        handler.send_response(200)
+        handler.send_header('Content-Length', '0')
+        handler.end_headers()
+
+    def stats(self):
+        with self.lock:
+            return {'requests' : self.requests, 'not_modified' : self.not_modified, 'notifications' : self.notifications}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8865)
+    parser.add_argument('--page-size', type=int, default=20000)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--change-period', type=float, default=60.0)
+    parser.add_argument('--js-weight', type=int, default=0)
+    args = parser.parse_args()
+
+    farm = SiteFarm(args.page_size, args.change_rate, args.change_period, args.js_weight, port=args.port).start()
+    print('serving %s ...' % (farm.url(0)))
+    try:
+        farm.thread.join()
+    except KeyboardInterrupt:
+        farm.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import urllib.error
+import urllib.request
+from selenium.common.exceptions import WebDriverException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import monitors
+from module import settings
+from module import drivers
+from common import make_config
+from farm import SiteFarm
+
+class StubDriver():
+    # stands in for Chrome, plain HTTP so only the scheduler, saver and notifier cost is left
+    def __init__(self, *args, **kwargs):
+        self.page_source = ''
+        self.window_handles = ['main']
+        self.switch_to = self
+
+    def get(self, url):
+        try:
+            with urllib.request.urlopen(url) as response:
+                self.page_source = response.read().decode('utf8')
+        except urllib.error.URLError as e:
+            raise WebDriverException(str(e))
+
+    def window(self, handle):
+        pass
+
+    def close(self):
+        pass
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, command, arguments):
+        return {}
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def quit(self):
+        pass
+
+def processes(selenium_scheduler):
+    pids = {'web' : os.getpid(), 'sender' : selenium_scheduler.sender.send_process.pid}
+    for atom_index, atom in enumerate(selenium_scheduler.atoms):
+        name = 'atom_%d_' % (atom_index)
+        pids[name + 'timer'] = atom.timer.clock_process.pid
+        pids[name + 'registry'] = atom.timer.manager._process.pid
+        pids[name + 'fetch_supervisor'] = atom.fetcher.supervise_process.pid
+        pids[name + 'fetcher'] = atom.fetcher.fetch_pid.value
+        pids[name + 'saver'] = atom.saver.store_process.pid
+    return pids
+
+def read_proc(pid, file_name, key):
+    # linux only, None elsewhere
+    try:
+        with open('/proc/%d/%s' % (pid, file_name)) as f:
+            for line in f:
+                if line.startswith(key + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return None
+
+def store_size(store_path):
+    return sum(os.path.getsize(os.path.join(root, file_name)) for root, dirs, files in os.walk(store_path) for file_name in files)
+
+def snapshot(selenium_scheduler, farm, pids, store_path):
+    histogram = {'counts' : [0] * (len(selenium_scheduler.atoms[0].metrics.schedule_lag.buckets) + 1), 'sum' : 0.0}
+    for atom in selenium_scheduler.atoms:
+        lag = atom.metrics.schedule_lag
+        histogram['counts'] = [total + count for total, count in zip(histogram['counts'], list(lag.counts))]
+        histogram['sum'] += lag.sum.value
+
+    notify_stats = selenium_scheduler.get_notify_stats()
+    return {'time' : time.time(), 'checks' : sum(atom.metrics.checks.value.value for atom in selenium_scheduler.atoms), \
+            'failures' : sum(atom.metrics.check_failures.value.value for atom in selenium_scheduler.atoms), 'lag' : histogram, \
+            'written' : {name : read_proc(pid, 'io', 'write_bytes') for name, pid in pids.items()}, 'store_size' : store_size(store_path), \
+            'notifications' : notify_stats['line_notify']['sent'], 'farm' : farm.stats()}
+
+def quantile(buckets, counts, fraction):
+    total = sum(counts)
+    if not total:
+        return None
+    cumulative = 0
+    for bound, count in zip(list(buckets) + [float('inf')], counts):
+        cumulative += count
+        if cumulative >= fraction * total:
+            return bound
+
+def compare(selenium_scheduler, start, end):
+    duration = end['time'] - start['time']
+    buckets = selenium_scheduler.atoms[0].metrics.schedule_lag.buckets
+    lag_counts = [after - before for before, after in zip(start['lag']['counts'], end['lag']['counts'])]
+    lag_total = sum(lag_counts)
+    written = {name : end['written'][name] - start['written'][name] for name in end['written'] \
+               if end['written'][name] != None and start['written'][name] != None}
+
+    return {'duration' : duration, 'checks' : end['checks'] - start['checks'], 'checks_per_second' : (end['checks'] - start['checks']) / duration, \
+            'failures' : end['failures'] - start['failures'], \
+            'schedule_lag' : {'mean' : (end['lag']['sum'] - start['lag']['sum']) / lag_total if lag_total else None, \
+                              'p50' : quantile(buckets, lag_counts, 0.5), 'p95' : quantile(buckets, lag_counts, 0.95), \
+                              'p99' : quantile(buckets, lag_counts, 0.99)}, \
+            'bytes_written' : {'total' : sum(written.values()), 'processes' : written, 'store_growth' : end['store_size'] - start['store_size']}, \
+            'notifications' : end['notifications'] - start['notifications'], \
+            'notifications_per_second' : (end['notifications'] - start['notifications']) / duration, \
+            'farm_requests' : end['farm']['requests'] - start['farm']['requests'], \
+            'farm_not_modified' : end['farm']['not_modified'] - start['farm']['not_modified']}
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), \
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--fetcher', choices=['chrome', 'stub', 'http'], default='stub')
+    parser.add_argument('--watches', type=int, default=200)
+    parser.add_argument('--interval', type=float, default=10.0)
+    parser.add_argument('--atoms', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--page-size', type=int, default=20000)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--change-period', type=float, default=30.0)
+    parser.add_argument('--js-weight', type=int, default=0)
+    # every farm page is on 127.0.0.1, so the per-domain limits are off unless asked for
+    parser.add_argument('--domain-concurrency', type=int, help='checks in flight per domain, unlimited by default')
+    parser.add_argument('--domain-spacing', type=float, default=0.0)
+    parser.add_argument('--warmup', type=float, default=10.0)
+    parser.add_argument('--duration', type=float, default=60.0)
+    parser.add_argument('--driver-path', default='./chromedriver')
+    parser.add_argument('--output', help='also write the JSON results to this file')
+    args = parser.parse_args()
+
+    if args.fetcher == 'stub':
+        # fork keeps the patched class in the fetch processes
+        drivers.webdriver.Chrome = StubDriver
+
+    farm = SiteFarm(args.page_size, args.change_rate, args.change_period, args.js_weight).start()
+    store_path = tempfile.mkdtemp()
+    selenium_scheduler = None
+    try:
+        config = make_config(store_path, args.atoms)
+        config.update({'driver_path' : args.driver_path, 'default_interval' : args.interval, 'fetch_workers' : args.workers, \
+                       'max_browsers' : args.atoms * args.workers, 'driver_pool_size' : args.workers, \
+                       'fetch_mode' : 'http' if args.fetcher == 'http' else 'browser', 'line_notify_url' : farm.notify_url(), \
+                       'notify_window' : 1.0, 'notify_rate' : 60000.0, 'notify_burst' : 1000, 'startup_spread' : args.interval, \
+                       'domain_concurrency' : args.domain_concurrency or args.watches, 'domain_spacing' : args.domain_spacing})
+        global_setting = settings.GlobalSetting(config)
+        global_setting.line_notify_token = 'benchmark'
+        selenium_scheduler = monitors.SeleniumScheduler(config, global_setting)
+
+        start_time = time.time()
+        for index in range(args.watches):
+            web_container = monitors.WebContainer(config, farm.url(index), args.interval)
+            web_container.id = str(index)
+            selenium_scheduler.register(web_container)
+        register_time = time.time() - start_time
+        print('registered %d watches in %.3f s, warming up ...' % (args.watches, register_time), file=sys.stderr)
+
+        time.sleep(args.warmup)
+        pids = processes(selenium_scheduler)
+        start = snapshot(selenium_scheduler, farm, pids, store_path)
+        time.sleep(args.duration)
+        end = snapshot(selenium_scheduler, farm, pids, store_path)
+
+        results = {'commit' : git_commit(), 'time_stamp' : time.time(), 'arguments' : vars(args), 'register_time' : register_time}
+        results.update(compare(selenium_scheduler, start, end))
+        results['rss_kb'] = {name : read_proc(pid, 'status', 'VmRSS') for name, pid in pids.items()}
+
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(output)
+        print(output)
+    finally:
+        if selenium_scheduler:
+            selenium_scheduler.close()
+        farm.close()
+        shutil.rmtree(store_path)
+        os._exit(0)
+
+if __name__ == '__main__':
+    main()
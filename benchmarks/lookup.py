@@ -0,0 +1,59 @@
+import os
+import sys
+import time
+import shutil
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import monitors
+from module import settings
+from common import make_config, populate
+
+def bench(label, function, repeat):
+    start_time = time.time()
+    for _ in range(repeat):
+        function()
+    print('%-32s %8.3f ms/call' % (label, (time.time() - start_time) / repeat * 1000))
+
+def scan(selenium_scheduler, container_id):
+    # what find_container did before the index, one pass over every atom
+    for atom_index, atom in enumerate(selenium_scheduler.atoms):
+        for web_container in atom.timer.duties.values():
+            if web_container.id == container_id:
+                return web_container, atom_index
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--watches', type=int, default=10000)
+    parser.add_argument('--tags', type=int, default=100)
+    parser.add_argument('--atoms', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    store_path = tempfile.mkdtemp()
+    selenium_scheduler = None
+    try:
+        config = make_config(store_path, args.atoms)
+        populate(config, args.watches, 2, args.tags)
+        selenium_scheduler = monitors.SeleniumScheduler(config, settings.GlobalSetting(config))
+        ids = selenium_scheduler.get_ids()
+        print('watches: %d  tags: %d' % (len(ids), args.tags))
+
+        bench('find_container (edit/diff)', lambda: selenium_scheduler.find_container(random.choice(ids)), args.repeat)
+        bench('linear scan (previous)', lambda: scan(selenium_scheduler, random.choice(ids)), max(1, args.repeat // 50))
+        bench('recheck id', lambda: selenium_scheduler.recheck(container_id=random.choice(ids)), args.repeat)
+        bench('recheck tag', lambda: selenium_scheduler.recheck(tag='tag' + str(random.randrange(args.tags))), args.repeat)
+        bench('get_duties tag', lambda: selenium_scheduler.get_duties(tag='tag' + str(random.randrange(args.tags))), max(1, args.repeat // 10))
+
+        deleted = random.sample(ids, min(len(ids), args.repeat))
+        bench('delete', lambda: selenium_scheduler.delete(deleted.pop()), len(deleted))
+    finally:
+        if selenium_scheduler:
+            selenium_scheduler.close()
+        shutil.rmtree(store_path)
+        os._exit(0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+from multiprocessing import Manager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import monitors
+
+def make_container(config, index, page_size, snapshots):
+    web_container = monitors.WebContainer(config, 'http://example.com/' + str(index), 60)
+    web_container.id = str(index)
+    for snapshot in range(snapshots):
+        web_container.update('<p>' + str(snapshot) * page_size + '</p>')
+    return web_container
+
+def bench_registry(manager, web_containers, updates):
+    registry = monitors.Registry(manager)
+    for web_container in web_containers:
+        registry.add(web_container)
+
+    start_time = time.time()
+    for update_index in range(updates):
+        web_container = web_containers[update_index % len(web_containers)]
+        web_container.time_value = time.time()
+        registry.update(web_container, 'time_value')
+    return (time.time() - start_time) / updates
+
+def bench_list(manager, web_containers, updates):
+    # the previous Manager().list layout, kept for comparison
+    duties = manager.list(web_containers)
+    lock = manager.Lock()
+
+    start_time = time.time()
+    for update_index in range(updates):
+        index = update_index % len(web_containers)
+        lock.acquire()
+        tempt = list(duties)
+        tempt[index].time_value = time.time()
+        duties[ : ] = tempt
+        lock.release()
+    return (time.time() - start_time) / updates
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='100,1000,10000')
+    parser.add_argument('--updates', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=1024)
+    parser.add_argument('--snapshots', type=int, default=2)
+    parser.add_argument('--legacy', action='store_true', help='also time the Manager().list layout')
+    args = parser.parse_args()
+
+    config = {'max_snapshots' : args.snapshots, 'blobs_path' : tempfile.mkdtemp(), 'fetch_mode' : 'browser', 'browser_extract' : False}
+    manager = Manager()
+    for size in [int(size) for size in args.sizes.split(',')]:
+        web_containers = [make_container(config, index, args.page_size, args.snapshots) for index in range(size)]
+        result = 'watches: %6d  registry: %8.3f ms/update' % (size, bench_registry(manager, web_containers, args.updates) * 1000)
+        if args.legacy:
+            legacy_updates = max(1, args.updates // 10)
+            result += '  list: %8.3f ms/update' % (bench_list(manager, web_containers, legacy_updates) * 1000)
+        print(result)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from module import monitors
+from module import settings
+from common import make_config, populate
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--watches', type=int, default=10000)
+    parser.add_argument('--snapshots', type=int, default=10)
+    parser.add_argument('--atoms', type=int, default=3)
+    args = parser.parse_args()
+
+    store_path = tempfile.mkdtemp()
+    selenium_scheduler = None
+    try:
+        config = make_config(store_path, args.atoms)
+        populate(config, args.watches, args.snapshots)
+        global_setting = settings.GlobalSetting(config)
+
+        start_time = time.time()
+        selenium_scheduler = monitors.SeleniumScheduler(config, global_setting)
+        loaded = sum(len(atom.timer.duties) for atom in selenium_scheduler.atoms)
+        print('watches: %d  snapshots: %d  startup: %.3f s' % (loaded, args.snapshots, time.time() - start_time))
+    finally:
+        if selenium_scheduler:
+            selenium_scheduler.close()
+        shutil.rmtree(store_path)
+        os._exit(0)
+
+if __name__ == '__main__':
+    main()
@@ -5,11 +5,15 @@ import requests
 from threading import Event
 import flask_login
 from flask_login import login_required
-from flask import Flask, render_template, request, send_from_directory, abort, redirect, url_for, flash
+from flask import Flask, render_template, request, send_from_directory, abort, redirect, url_for, flash, jsonify, session, make_response, Response, \
+    stream_with_context, get_flashed_messages
 from module import settings
 from module import monitors
 from module import forms
 from module import tools
+from module import blobs
+from module import metrics
+from module import transfer
 
 config = tools.load_env()
 
@@ -26,18 +30,25 @@ login_manager.login_view = 'login'
 app.secret_key = tools.init_secret(config['store_path'])
 
 @app.template_filter('last_checked_time')
-def _jinja2_filter_datetime(web_container, format='%Y-%m-%d %H:%M:%S'):
-    web_container_time = time.time() if web_container.time_value == float('inf') else web_container.time_value
+def _jinja2_filter_datetime(summary, format='%Y-%m-%d %H:%M:%S'):
+    web_container_time = time.time() if summary.last_checked == float('inf') else summary.last_checked
     return timeago.format(web_container_time, time.time())
 
 @app.template_filter('last_changed_time')
-def _jinja2_filter_datetime(web_container, format='%Y-%m-%d %H:%M:%S'):
-    web_container_time = web_container.get_latest_changed()
+def _jinja2_filter_datetime(summary, format='%Y-%m-%d %H:%M:%S'):
+    web_container_time = summary.last_changed
     if web_container_time:
         return timeago.format(web_container_time, time.time())
     else:
         return 'Not yet'
 
+def stream_template(template_name, **context):
+    # flashes are popped before the first chunk, the session cookie goes out with the headers
+    get_flashed_messages(with_categories=True)
+    app.update_template_context(context)
+    template = app.jinja_env.get_template(template_name)
+    return Response(stream_with_context(template.stream(context)))
+
 @login_manager.user_loader
 def user_loader(email):
     user = tools.User()
@@ -119,12 +130,24 @@ def index():
     show_tag = request.args.get('tag')
     pause_container_id = request.args.get('pause')
 
-    web_containers = selenium_scheduler.get_duties(tag=show_tag)
-    all_tags = selenium_scheduler.get_tags()
+    if pause_container_id:
+        selenium_scheduler.toggle_pause(pause_container_id)
+        return redirect(url_for('index', tag=show_tag))
 
-    output = render_template('watch-overview.html', web_containers=web_containers, tags=all_tags, \
-        show_tag=show_tag, has_unviewed=False)
-    return output
+    page = request.args.get('page', 1, type=int)
+    summaries, page, pages = selenium_scheduler.get_overview(tag=show_tag, page=page, page_size=config['overview_page_size'])
+
+    # relative times on the page go stale, so the tag also rolls over every minute
+    etag = selenium_scheduler.overview.etag(show_tag, page, int(time.time() // 60))
+    if not session.get('_flashes') and etag in request.if_none_match:
+        return Response(status=304)
+
+    all_tags = selenium_scheduler.get_tags()
+    output = render_template('watch-overview.html', summaries=summaries, tags=all_tags, \
+        show_tag=show_tag, has_unviewed=False, page=page, pages=pages, page_size=config['overview_page_size'])
+    response = make_response(output)
+    response.set_etag(etag)
+    return response
 
 
 @app.route('/favicon.ico', methods=['GET'])
@@ -154,11 +177,54 @@ def api_add():
     flash('Watch added.')
     return redirect(url_for('index'))
 
+@app.route('/import', methods=['GET', 'POST'])
+@login_required
+def import_page():
+    remaining = ''
+    if request.method == 'POST':
+        rows, invalid = transfer.parse_import(request.form.get('urls', ''))
+        job = transfer.start_import(selenium_scheduler, global_setting, rows, invalid)
+        flash('Importing %d watches, %d already watched.' % (job.total, job.duplicates))
+        if invalid:
+            flash('%d lines could not be imported.' % (len(invalid)), 'error')
+        remaining = '\n'.join(invalid)
+
+    output = render_template('import.html', remaining=remaining)
+    return output
+
+@app.route('/api/import', methods=['POST'])
+@login_required
+def api_import():
+    # newline, CSV or JSON body, registered in the background
+    rows, invalid = transfer.parse_import(request.get_data(as_text=True), request.args.get('format'))
+    job = transfer.start_import(selenium_scheduler, global_setting, rows, invalid)
+    return jsonify(dict(job.stats(), invalid_entries=invalid)), 202
+
+@app.route('/api/import/<string:job_id>', methods=['GET'])
+@login_required
+def api_import_progress(job_id):
+    job = selenium_scheduler.imports.get(job_id)
+    if not job:
+        abort(404)
+    return jsonify(job.stats())
+
+@app.route('/api/export', methods=['GET'])
+@login_required
+def api_export():
+    export_format = request.args.get('format', 'json')
+    if export_format == 'csv':
+        chunks, mimetype = transfer.export_csv(selenium_scheduler.get_containers()), 'text/csv'
+    else:
+        export_format, chunks, mimetype = 'json', transfer.export_json(selenium_scheduler.get_containers()), 'application/json'
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = 'attachment; filename=seleniumonitor-watches.' + export_format
+    return response
+
 @app.route('/edit/<string:container_id>', methods=['GET', 'POST'])
 @login_required
 def edit_page(container_id):
     form = forms.ContainerForm(request.form)
-    web_container, atom_index, web_container_index = selenium_scheduler.find_container(container_id)
+    web_container, atom_index = selenium_scheduler.find_container(container_id)
 
     if request.method == 'GET':
         if web_container:
@@ -175,12 +241,25 @@ def edit_page(container_id):
             interval = form.interval.data
             tags = form.tags.data.strip().split(' ')
             css_selector = form.css_selector.data.strip()
+            ignore_css_selector = form.ignore_css_selector.data.strip()
+            fetch_mode = form.fetch_mode.data
+            browser_extract = form.browser_extract.data
+            capture_html = form.capture_html.data
             ignore_text = form.ignore_text.data
             headers = form.headers.data
             notification_emails = form.notification_emails.data
-
-            web_container.setting.update(url=url, interval=interval, title=title, tags=tags, emails=notification_emails)
-            selenium_scheduler.update(web_container, atom_index, web_container_index)
+            adaptive = form.adaptive.data
+            min_interval = form.min_interval.data
+            max_interval = form.max_interval.data
+            fetch_profile = form.fetch_profile.data
+            wait_selector = form.wait_selector.data.strip()
+
+            web_container.setting.update(url=url, interval=interval, title=title, tags=tags, emails=notification_emails, fetch_mode=fetch_mode, \
+                                         browser_extract=browser_extract, capture_html=capture_html, \
+                                         css_selector=css_selector, ignore_css_selector=ignore_css_selector, ignore_text=ignore_text, \
+                                         adaptive=adaptive, min_interval=min_interval, max_interval=max_interval, \
+                                         fetch_profile=fetch_profile, wait_selector=wait_selector, headers=headers)
+            selenium_scheduler.update(web_container, atom_index)
             flash('Updated watch.')
 
             if form.trigger_notify.data:
@@ -206,12 +285,17 @@ def api_delete():
 @login_required
 def preview_page(container_id):
     extra_stylesheets = ['/static/styles/diff.css']
-    web_container, atom_index, web_container_index = selenium_scheduler.find_container(container_id)
+    web_container, atom_index = selenium_scheduler.find_container(container_id)
 
-    if web_container:
+    if web_container and len(web_container.history):
         latest_history = web_container.get_latest_history()
-        output = render_template('preview.html', text_content=latest_history.text, extra_stylesheets=extra_stylesheets)
-        return output
+        # a byte window of the stored text, whole lines only, read straight from the blob
+        length = max(1, request.args.get('length', config['preview_page_size'], type=int))
+        page = max(1, request.args.get('page', 1, type=int))
+        start = max(0, request.args.get('start', (page - 1) * length, type=int))
+        lines = blobs.LineWindow(blobs.BlobStore(config['blobs_path']), latest_history.text_ref, start, length)
+        return stream_template('preview.html', lines=lines, start=start, length=length, container_id=container_id, \
+                                    extra_stylesheets=extra_stylesheets)
     else:
         flash('No history found for the specified link !!!', 'error')
         return redirect(url_for('index'))
@@ -221,19 +305,25 @@ def preview_page(container_id):
 def diff_history_page(container_id):
     extra_stylesheets = ['/static/styles/diff.css']
     previous_version = request.args.get('previous_version')
+    diff_type = request.args.get('diff_type', 'words')
     
-    web_container, atom_index, web_container_index = selenium_scheduler.find_container(container_id)
-    previous_version_index = web_container.find_version_index(previous_version) if previous_version else -2
+    web_container, atom_index = selenium_scheduler.find_container(container_id)
 
-    if web_container:
-        latest_history = web_container.get_latest_history()
-        previous_history = web_container.get_previous_history(previous_version_index)
+    if web_container and len(web_container.history):
+        previous_version_index = web_container.find_version_index(previous_version) if previous_version else None
+        if previous_version_index == None:
+            previous_version_index = -2 if len(web_container.history) >= 2 else -1
+        diff = web_container.get_diff(previous_version_index)
         versions = web_container.get_time_stamps()
+
+        page_size = config['diff_page_size']
+        pages = max(1, (len(diff['hunks']) + page_size - 1) // page_size)
+        page = min(max(1, request.args.get('page', 1, type=int)), pages)
+        hunks = diff['hunks'][(page - 1) * page_size : page * page_size]
         
-        output = render_template('diff.html', latest_content=latest_history.text, previous_content=previous_history.text, \
+        return stream_template('diff.html', diff=diff, hunks=hunks, page=page, pages=pages, diff_type=diff_type, \
                                     extra_stylesheets=extra_stylesheets, versions=versions, container_id=container_id,
                                     latest_version=versions[-1], previous_version=versions[previous_version_index])
-        return output
     else:
         flash('No history found for the specified link !!!', 'error')
         return redirect(url_for('index'))
@@ -252,6 +342,44 @@ def api_watch_checknow():
     flash('Watches are rechecking.')
     return redirect(url_for('index', tag=tag))
 
+@app.route('/api/fetch-stats', methods=['GET'])
+@login_required
+def api_fetch_stats():
+    return jsonify(selenium_scheduler.get_fetch_stats())
+
+@app.route('/api/timings/<string:container_id>', methods=['GET'])
+@login_required
+def api_timings(container_id):
+    web_container, atom_index = selenium_scheduler.find_container(container_id)
+    if not web_container:
+        abort(404)
+    return jsonify({'summary' : web_container.get_timing_summary(), 'history' : web_container.timings})
+
+@app.route('/api/interval-report', methods=['GET'])
+@login_required
+def api_interval_report():
+    return jsonify(selenium_scheduler.get_interval_report())
+
+@app.route('/api/domain-stats', methods=['GET'])
+@login_required
+def api_domain_stats():
+    return jsonify(selenium_scheduler.get_domain_stats())
+
+@app.route('/api/balance-stats', methods=['GET'])
+@login_required
+def api_balance_stats():
+    return jsonify(selenium_scheduler.get_balance_stats())
+
+@app.route('/api/notify-stats', methods=['GET'])
+@login_required
+def api_notify_stats():
+    return jsonify(selenium_scheduler.get_notify_stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics_page():
+    # scrapers can't log in, the page only carries counts and the tags listed in METRICS_TAGS
+    return Response(metrics.render(selenium_scheduler), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     tools.init_config(config)
     global_setting = settings.GlobalSetting(config)
@@ -0,0 +1,46 @@
+import time
+
+DAY = 86400.0
+
+def effective_interval(web_container, config, time_value=None):
+    # the fixed interval, or one derived from how often the page changed in its snapshots
+    setting = web_container.setting
+    interval = web_container.get_fixed_interval()
+    history = web_container.history
+    if not setting.adaptive or not len(history):
+        return interval
+
+    time_value = time_value or time.time()
+    # unchanged checks overwrite the latest snapshot and its changed flag, so changes are read from where the checksum moves,
+    # timed by the last check that still saw the old version
+    changes = [history[index - 1].time_stamp for index in range(1, len(history)) if history[index].checksum != history[index - 1].checksum]
+    quiet = time_value - (changes[-1] if changes else history[0].time_stamp)
+    if len(changes) >= 2:
+        # the mean gap between changes, or the quiet time since the last one when that is longer
+        gap = max((changes[-1] - changes[0]) / (len(changes) - 1), quiet)
+    else:
+        # no rate to go by yet, only backing off from the fixed interval
+        gap = max(quiet, interval * config['adaptive_factor'])
+
+    min_interval = setting.min_interval or config['adaptive_min_interval']
+    max_interval = setting.max_interval or config['adaptive_max_interval']
+    # tightening is immediate, backing off at most doubles the interval per check
+    previous = web_container.effective_interval or interval
+    target = min(gap / config['adaptive_factor'], previous * 2)
+    return min(max(target, min_interval), max_interval)
+
+def report(summaries):
+    fixed_checks, checks = 0.0, 0.0
+    watches = []
+    for summary in summaries:
+        if summary.pause:
+            continue
+        fixed_checks += DAY / summary.fixed_interval
+        checks += DAY / summary.interval
+        if summary.adaptive:
+            watches.append({'id' : summary.id, 'title' : summary.title, 'fixed_interval' : summary.fixed_interval, 'interval' : summary.interval, \
+                            'checks_saved_per_day' : DAY / summary.fixed_interval - DAY / summary.interval})
+
+    watches.sort(key=lambda watch : -watch['checks_saved_per_day'])
+    return {'fixed_checks_per_day' : fixed_checks, 'checks_per_day' : checks, 'checks_saved_per_day' : fixed_checks - checks, \
+            'saved_ratio' : (fixed_checks - checks) / fixed_checks if fixed_checks else 0.0, 'adaptive_watches' : len(watches), 'watches' : watches}
@@ -0,0 +1,153 @@
+import io
+import codecs
+import os
+import gzip
+import time
+import hashlib
+import tempfile
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SUFFIXES = ['.gz', '.zst']
+# unreferenced blobs younger than this may belong to a check that is not saved yet
+COLLECT_GRACE = 3600.0
+
+class BlobStore():
+    def __init__(self, path):
+        self.path = path
+        self.suffix = '.zst' if zstandard else '.gz'
+
+    def count_key(self, content):
+        return hashlib.md5(content.encode('utf8')).hexdigest()
+
+    def find_path(self, key):
+        for suffix in [self.suffix] + SUFFIXES:
+            file_path = os.path.join(self.path, key[ : 2], key + suffix)
+            if os.path.isfile(file_path):
+                return file_path
+        return None
+
+    def put(self, content, key=None):
+        key = key or self.count_key(content)
+        # content addressed, so an unchanged page or the same page on another watch is stored once
+        file_path = self.find_path(key)
+        if file_path and self.touch(file_path):
+            return key
+
+        dir_path = os.path.join(self.path, key[ : 2])
+        os.makedirs(dir_path, exist_ok=True)
+        data = self.compress(content.encode('utf8'))
+
+        fd, tmp_path = tempfile.mkstemp(dir=dir_path)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(dir_path, key + self.suffix))
+        return key
+
+    def get(self, key):
+        file_path = self.find_path(key) if key else None
+        if not file_path:
+            return None
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        return self.decompress(data, file_path).decode('utf8')
+
+    def open(self, key):
+        # a decompressing reader, so large snapshots can be read without holding them in memory
+        file_path = self.find_path(key) if key else None
+        if not file_path:
+            return None
+        if file_path.endswith('.zst'):
+            return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb')))
+        return gzip.open(file_path, 'rb')
+
+    def touch(self, file_path):
+        # a reused blob counts as new for the collector, False when it was collected meanwhile
+        try:
+            os.utime(file_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def walk(self):
+        for root, dirs, files in os.walk(self.path):
+            for file_name in files:
+                key, suffix = os.path.splitext(file_name)
+                if suffix in SUFFIXES:
+                    yield key, os.path.join(root, file_name)
+
+    def delete(self, key):
+        file_path = self.find_path(key)
+        if file_path:
+            os.remove(file_path)
+
+    def compress(self, data):
+        if zstandard:
+            return zstandard.ZstdCompressor().compress(data)
+        return gzip.compress(data)
+
+    def decompress(self, data, file_path):
+        if file_path.endswith('.zst'):
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+class BlobCollector():
+    # mark and sweep, a blob is removed only when two marks in a row found nothing pointing at it
+    def __init__(self, blob_store, grace=COLLECT_GRACE):
+        self.blob_store = blob_store
+        self.grace = grace
+        self.candidates = set()
+
+    def collect(self, live_keys, time_value=None):
+        time_value = time_value or time.time()
+        candidates = set()
+        removed = 0
+        for key, file_path in self.blob_store.walk():
+            if key in live_keys:
+                continue
+            try:
+                if os.path.getmtime(file_path) > time_value - self.grace:
+                    continue
+                if key in self.candidates:
+                    os.remove(file_path)
+                    removed += 1
+                else:
+                    candidates.add(key)
+            except FileNotFoundError:
+                pass
+        self.candidates = candidates
+        return removed
+
+class LineWindow():
+    # whole lines of a blob that begin inside the byte window [start, start + length)
+    def __init__(self, blob_store, key, start=0, length=None):
+        self.blob_store = blob_store
+        self.key = key
+        self.start = start
+        self.length = length
+        self.more = False
+
+    def __iter__(self):
+        reader = self.blob_store.open(self.key)
+        if reader == None:
+            return
+        # very long lines come in pieces, the decoder keeps characters split between them whole
+        decoder = codecs.getincrementaldecoder('utf8')('replace')
+        limit = max(self.length or 0, 65536)
+        with reader:
+            offset = 0
+            while True:
+                line = reader.readline(limit)
+                if not line:
+                    break
+                if self.length != None and offset >= self.start + self.length:
+                    self.more = True
+                    break
+                text = decoder.decode(line)
+                if offset >= self.start:
+                    yield text
+                offset += len(line)
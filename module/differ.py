@@ -0,0 +1,98 @@
+import re
+import json
+import difflib
+import hashlib
+from functools import lru_cache
+from module import blobs
+
+CONTEXT_LINES = 3
+# word level marks are skipped on lines too long to be worth it
+MAX_WORDS = 2000
+
+def make_diff(previous_text, latest_text, context=CONTEXT_LINES):
+    previous_lines = previous_text.splitlines()
+    latest_lines = latest_text.splitlines()
+    matcher = difflib.SequenceMatcher(None, previous_lines, latest_lines)
+
+    hunks = []
+    inserted, deleted = 0, 0
+    # unchanged lines between hunks are folded into a count
+    position = 0
+    for group in matcher.get_grouped_opcodes(context):
+        lines = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                lines += [['equal', [[False, line]]] for line in previous_lines[i1 : i2]]
+                continue
+            deleted += i2 - i1
+            inserted += j2 - j1
+            if tag == 'replace':
+                paired = min(i2 - i1, j2 - j1)
+                for previous_line, latest_line in zip(previous_lines[i1 : i1 + paired], latest_lines[j1 : j1 + paired]):
+                    previous_segments, latest_segments = diff_words(previous_line, latest_line)
+                    lines += [['delete', previous_segments], ['insert', latest_segments]]
+                i1, j1 = i1 + paired, j1 + paired
+            lines += [['delete', [[True, line]]] for line in previous_lines[i1 : i2]]
+            lines += [['insert', [[True, line]]] for line in latest_lines[j1 : j2]]
+
+        start = group[0][1]
+        hunks.append({'skipped' : start - position, 'previous_line' : start + 1, 'latest_line' : group[0][3] + 1, 'lines' : lines})
+        position = group[-1][2]
+
+    return {'hunks' : hunks, 'tail' : len(previous_lines) - position if hunks else 0, 'inserted' : inserted, 'deleted' : deleted}
+
+def diff_words(previous_line, latest_line):
+    previous_words = re.split(r'(\s+)', previous_line)
+    latest_words = re.split(r'(\s+)', latest_line)
+    if len(previous_words) + len(latest_words) > MAX_WORDS:
+        return [[True, previous_line]], [[True, latest_line]]
+
+    previous_segments, latest_segments = [], []
+    matcher = difflib.SequenceMatcher(None, previous_words, latest_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        changed = tag != 'equal'
+        if i2 > i1:
+            add_segment(previous_segments, changed, ''.join(previous_words[i1 : i2]))
+        if j2 > j1:
+            add_segment(latest_segments, changed, ''.join(latest_words[j1 : j2]))
+    return previous_segments, latest_segments
+
+def add_segment(segments, changed, text):
+    if segments and segments[-1][0] == changed:
+        segments[-1][1] += text
+    else:
+        segments.append([changed, text])
+
+def diff_key(previous_ref, latest_ref):
+    return hashlib.md5((str(previous_ref) + ':' + str(latest_ref) + ':diff').encode('utf8')).hexdigest()
+
+def save_diff(blob_store, previous_data, latest_data):
+    # computed once by the fetcher when a change is found, then read by the diff page and notifications
+    diff = make_diff(previous_data.text or '', latest_data.text or '')
+    blob_store.put(json.dumps(diff), diff_key(previous_data.text_ref, latest_data.text_ref))
+    return diff
+
+@lru_cache(maxsize=64)
+def load_diff(blobs_path, previous_ref, latest_ref):
+    blob_store = blobs.BlobStore(blobs_path)
+    content = blob_store.get(diff_key(previous_ref, latest_ref))
+    if content != None:
+        return json.loads(content)
+    # any other pair of versions is diffed on demand and only kept in this cache
+    return make_diff(blob_store.get(previous_ref) or '', blob_store.get(latest_ref) or '')
+
+def get_diff(blobs_path, previous_data, latest_data):
+    return load_diff(blobs_path, previous_data.text_ref, latest_data.text_ref)
+
+def make_excerpt(diff, max_lines=5, max_length=200):
+    excerpt = []
+    for hunk in diff['hunks']:
+        for op, segments in hunk['lines']:
+            if op == 'equal':
+                continue
+            line = ''.join(text for _, text in segments).strip()
+            if line:
+                excerpt.append(('+ ' if op == 'insert' else '- ') + line[ : max_length])
+            if len(excerpt) >= max_lines:
+                return '\n'.join(excerpt)
+    return '\n'.join(excerpt)
@@ -0,0 +1,198 @@
+import time
+import threading
+from contextlib import contextmanager
+from multiprocessing import Value
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException, TimeoutException
+
+IMAGES = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.bmp', '*.ico', '*.svg']
+MEDIA = ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m4a', '*.m3u8']
+FONTS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+TRACKERS = ['*google-analytics.com*', '*googletagmanager.com*', '*googlesyndication.com*', '*doubleclick.net*', '*connect.facebook.net*', \
+            '*hotjar.com*', '*scorecardresearch.com*', '*quantserve.com*', '*criteo.com*', '*adnxs.com*', '*taboola.com*', '*outbrain.com*']
+
+# url patterns each fetch profile keeps the browser from loading
+PROFILES = {'full' : [], 'light' : IMAGES + MEDIA + FONTS, 'minimal' : IMAGES + MEDIA + FONTS + TRACKERS}
+
+def blocked_urls(config, setting):
+    profile = setting.fetch_profile or config['fetch_profile']
+    if profile == 'full':
+        return []
+    return PROFILES.get(profile, PROFILES['light']) + config['blocked_urls']
+
+def prepare(driver, config, setting):
+    # pooled sessions are shared by every watch, so both are set before each navigation
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls' : blocked_urls(config, setting)})
+    driver.execute_cdp_cmd('Network.setExtraHTTPHeaders', {'headers' : setting.headers or {}})
+
+def wait_ready(driver, config, setting):
+    # a selector that never shows up is a change worth a snapshot, not a broken browser
+    wait = WebDriverWait(driver, config['wait_timeout'])
+    try:
+        if setting.wait_selector:
+            wait.until(expected_conditions.presence_of_element_located((By.CSS_SELECTOR, setting.wait_selector)))
+        elif config['page_load_strategy'] == 'none':
+            wait.until(lambda driver : driver.execute_script('return document.readyState') != 'loading')
+    except TimeoutException:
+        return False
+    return True
+
+class DriverSession():
+    def __init__(self, driver, startup_time):
+        self.driver = driver
+        self.startup_time = startup_time
+        self.pages = 0
+        self.last_used = time.time()
+
+class DriverPool():
+    def __init__(self, config, chrome_options, browser_slots, metrics):
+        self.config = config
+        self.chrome_options = chrome_options
+        self.browser_slots = browser_slots
+        self.metrics = metrics
+        self.size = config['driver_pool_size']
+        self.max_pages = config['driver_max_pages']
+        self.idle_timeout = config['driver_idle_timeout']
+
+        # sessions only live inside the fetch process, counters are shared with the web process
+        self.idle = []
+        self.idle_lock = threading.Lock()
+
+        self.hits = Value('i', 0)
+        self.misses = Value('i', 0)
+        self.recycles = Value('i', 0)
+        self.startups = Value('i', 0)
+        self.startup_time = Value('d', 0.0)
+        # browser slots taken by this pool, given back by reclaim when its fetch process died
+        self.held = Value('i', 0)
+
+    @contextmanager
+    def session(self):
+        session = self.acquire()
+        try:
+            yield session.driver
+        except BaseException:
+            # a session left mid page by any error is not trusted again, and its slot must not leak
+            self.discard(session)
+            raise
+        else:
+            self.release(session)
+
+    def acquire(self):
+        with self.idle_lock:
+            session = self.idle.pop() if self.idle else None
+
+        if session:
+            self.count(self.hits)
+            return session
+
+        self.count(self.misses)
+        return self.launch()
+
+    def release(self, session):
+        session.pages += 1
+        if session.pages >= self.max_pages:
+            self.discard(session)
+            return
+
+        try:
+            self.reset(session.driver)
+        except WebDriverException:
+            self.discard(session)
+            return
+
+        session.last_used = time.time()
+        with self.idle_lock:
+            if len(self.idle) < self.size:
+                self.idle.append(session)
+                return
+        self.quit(session)
+
+    def reap(self):
+        # give browser slots back so busier atoms can launch sessions
+        expired_time = time.time() - self.idle_timeout
+        with self.idle_lock:
+            expired = [session for session in self.idle if session.last_used < expired_time]
+            self.idle = [session for session in self.idle if session.last_used >= expired_time]
+        for session in expired:
+            self.quit(session)
+
+    def discard(self, session):
+        self.count(self.recycles)
+        self.quit(session)
+
+    def launch(self):
+        # well inside CHECK_TIMEOUT, a fleet short of browsers fails checks instead of waiting forever
+        if not self.browser_slots.acquire(timeout=self.config['check_timeout'] / 2):
+            raise WebDriverException('No browser slot free after %d seconds' % (self.config['check_timeout'] / 2))
+        self.count(self.held)
+        start_time = time.time()
+        try:
+            driver = webdriver.Chrome(self.config['driver_path'], options=self.chrome_options)
+            driver.set_page_load_timeout(self.config['page_load_timeout'])
+            driver.execute_cdp_cmd('Network.enable', {})
+        except Exception:
+            self.release_slot()
+            raise
+        startup_time = time.time() - start_time
+        self.metrics.chrome_startup.observe(startup_time)
+
+        with self.startups.get_lock():
+            self.startups.value += 1
+        with self.startup_time.get_lock():
+            self.startup_time.value += startup_time
+        return DriverSession(driver, startup_time)
+
+    def reset(self, driver):
+        # delete_all_cookies and the storage script only reach the current origin, the CDP calls clear every one
+        handles = driver.window_handles
+        for handle in handles[1 : ]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_script('try { window.sessionStorage.clear(); } catch (e) {}')
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin' : '*', 'storageTypes' : 'all'})
+        driver.get('about:blank')
+
+    def quit(self, session):
+        try:
+            session.driver.quit()
+        except WebDriverException:
+            pass
+        finally:
+            self.release_slot()
+
+    def release_slot(self):
+        with self.held.get_lock():
+            self.held.value -= 1
+        self.browser_slots.release()
+
+    def reclaim(self):
+        with self.held.get_lock():
+            held, self.held.value = self.held.value, 0
+        for _ in range(held):
+            self.browser_slots.release()
+
+    def close(self):
+        with self.idle_lock:
+            sessions, self.idle = self.idle, []
+        for session in sessions:
+            self.quit(session)
+
+    def count(self, counter):
+        with counter.get_lock():
+            counter.value += 1
+
+    def stats(self):
+        startups = self.startups.value
+        return {
+            'hits' : self.hits.value,
+            'misses' : self.misses.value,
+            'recycles' : self.recycles.value,
+            'startups' : startups,
+            'average_startup_time' : self.startup_time.value / startups if startups else 0.0
+        }
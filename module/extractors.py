@@ -0,0 +1,90 @@
+import re
+import json
+import hashlib
+from functools import lru_cache
+from lxml import etree
+from lxml.html import fromstring
+from lxml.cssselect import CSSSelector
+from inscriptis.html_engine import Inscriptis
+
+# lxml refuses a unicode string that still carries its encoding declaration
+XML_DECLARATION = re.compile(r'^<\?xml [^>]+?\?>')
+
+class Extractor():
+    def __init__(self, css_selector, ignore_css_selector, ignore_text):
+        self.selector = CSSSelector(css_selector) if css_selector else None
+        self.ignore_selector = CSSSelector(ignore_css_selector) if ignore_css_selector else None
+        self.ignore_patterns = [compile_ignore(line) for line in ignore_text if line]
+
+    def extract(self, html):
+        html = XML_DECLARATION.sub('', html.strip()).strip()
+        if not html:
+            return ''
+
+        try:
+            html_tree = fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            print('Could not parse page, stored as empty text: %s' % (e))
+            return ''
+
+        if self.ignore_selector:
+            for element in self.ignore_selector(html_tree):
+                element.drop_tree()
+
+        # convert only the selected subtrees instead of the whole page
+        if self.selector:
+            return '\n'.join([Inscriptis(element).get_text() for element in self.selector(html_tree)])
+        return Inscriptis(html_tree).get_text()
+
+    def filter(self, text):
+        if not self.ignore_patterns:
+            return text
+        lines = [line for line in text.splitlines() if not any(pattern.search(line) for pattern in self.ignore_patterns)]
+        return '\n'.join(lines)
+
+def compile_ignore(line):
+    # /regex/ lines are regular expressions, anything else is matched as plain text
+    if len(line) > 1 and line[0] == '/' and line[-1] == '/':
+        return re.compile(line.strip('/'))
+    return re.compile(re.escape(line), re.IGNORECASE)
+
+# the same filters as Extractor, run inside the page, only the text and a short hash come back
+BROWSER_EXTRACT_SCRIPT = '''
+var ignoreSelector = arguments[0], selector = arguments[1], previousHash = arguments[2];
+if (ignoreSelector) {
+    document.querySelectorAll(ignoreSelector).forEach(function (element) { element.remove(); });
+}
+var elements = selector ? Array.from(document.querySelectorAll(selector)) : [document.body];
+var text = elements.filter(Boolean).map(function (element) { return element.innerText; }).join('\\n');
+
+var h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+for (var i = 0; i < text.length; i++) {
+    var c = text.charCodeAt(i);
+    h1 = Math.imul(h1 ^ c, 2654435761);
+    h2 = Math.imul(h2 ^ c, 1597334677);
+}
+h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+var hash = (h2 >>> 0).toString(16) + (h1 >>> 0).toString(16) + ':' + text.length;
+
+return hash === previousHash ? {hash: hash} : {hash: hash, text: text};
+'''
+
+def filter_key(setting):
+    # changes whenever the text a snapshot is taken from would change for the same page
+    filters = [setting.css_selector, setting.ignore_css_selector, list(setting.ignore_text or [])]
+    return hashlib.md5(json.dumps(filters).encode('utf8')).hexdigest()
+
+def extract_in_browser(driver, setting, previous_hash):
+    # the hash carries the filters it was taken with, so an edited filter never skips the next snapshot
+    prefix = filter_key(setting) + ':'
+    previous_hash = previous_hash[len(prefix) : ] if previous_hash and previous_hash.startswith(prefix) else None
+    result = driver.execute_script(BROWSER_EXTRACT_SCRIPT, setting.ignore_css_selector, setting.css_selector, previous_hash)
+    return prefix + result['hash'], result.get('text')
+
+@lru_cache(maxsize=1024)
+def get_extractor(css_selector, ignore_css_selector, ignore_text):
+    return Extractor(css_selector, ignore_css_selector, ignore_text)
+
+def make_extractor(setting):
+    return get_extractor(setting.css_selector, setting.ignore_css_selector, tuple(setting.ignore_text or []))
@@ -1,4 +1,4 @@
-from wtforms import Form, BooleanField, StringField, PasswordField, validators, IntegerField, FloatField, fields, TextAreaField, Field
+from wtforms import Form, BooleanField, StringField, PasswordField, validators, IntegerField, FloatField, fields, TextAreaField, Field, SelectField
 from wtforms import widgets
 from wtforms.validators import ValidationError
 from wtforms.fields import html5
@@ -91,12 +91,36 @@ class ListRegex(object):
                     message = field.gettext('RegEx \'%s\' is not a valid regular expression.')
                     raise ValidationError(message % (line))
 
+class CssSelector(object):
+    def __init__(self, message=None):
+        self.message = message
+
+    def __call__(self, form, field):
+        from cssselect import GenericTranslator, SelectorError
+
+        if field.data and field.data.strip():
+            try:
+                GenericTranslator().css_to_xpath(field.data.strip())
+            except SelectorError:
+                message = field.gettext('\'%s\' is not a valid CSS selector.')
+                raise ValidationError(message % (field.data.strip()))
+
 class ContainerForm(Form):
     url = html5.URLField('URL', [validators.URL(require_tld=False)])
     title = StringField('Title')
     tags = StringField('Tags', [validators.Optional(), validators.Length(max=35)])
     interval = FloatField('Maximum time in seconds until recheck', [validators.Optional(), validators.NumberRange(min=1)])
-    css_selector = StringField('CSS Filter')
+    css_selector = StringField('CSS Filter', [CssSelector()])
+    ignore_css_selector = StringField('Ignore CSS', [CssSelector()])
+    browser_extract = BooleanField('Extract text inside the browser')
+    capture_html = BooleanField('Keep the raw HTML of each snapshot')
+    fetch_profile = SelectField('Fetch Profile', choices=[('', 'Default'), ('full', 'Load everything'), ('light', 'Skip images, media and fonts'), \
+                                                          ('minimal', 'Skip images, media, fonts and trackers')])
+    wait_selector = StringField('Wait For', [CssSelector()])
+    adaptive = BooleanField('Adapt the interval to how often the page changes')
+    min_interval = FloatField('Shortest adaptive interval in seconds', [validators.Optional(), validators.NumberRange(min=1)])
+    max_interval = FloatField('Longest adaptive interval in seconds', [validators.Optional(), validators.NumberRange(min=1)])
+    fetch_mode = SelectField('Fetch Mode', choices=[('browser', 'Browser'), ('auto', 'HTTP pre-check, browser when changed'), ('http', 'HTTP only')])
 
     ignore_text = StringListField('Ignore Text', [ListRegex()])
     notification_emails = StringListField('Notification Email')
@@ -119,6 +143,17 @@ def populate_edit_form(form, web_container):
     form.tags.data = ' '.join(web_container.setting.tags)
     form.interval.data = web_container.setting.interval
     form.css_selector.data = web_container.setting.css_selector
+    form.fetch_mode.data = web_container.setting.fetch_mode
+    form.browser_extract.data = web_container.setting.browser_extract
+    form.capture_html.data = web_container.setting.capture_html
+    form.fetch_profile.data = web_container.setting.fetch_profile
+    form.wait_selector.data = web_container.setting.wait_selector
+    form.headers.data = web_container.setting.headers
+    form.adaptive.data = web_container.setting.adaptive
+    form.min_interval.data = web_container.setting.min_interval
+    form.max_interval.data = web_container.setting.max_interval
+    form.ignore_css_selector.data = web_container.setting.ignore_css_selector
+    form.ignore_text.data = web_container.setting.ignore_text or []
     form.notification_emails.data = web_container.setting.notification_emails
 
 def populate_setting_form(form, config, global_setting):
@@ -0,0 +1,148 @@
+import bisect
+from multiprocessing import Value, Array
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+class Counter():
+    def __init__(self):
+        self.value = Value('d', 0.0)
+
+    def inc(self, value=1):
+        with self.value.get_lock():
+            self.value.value += value
+
+    def samples(self, name, labels):
+        return [(name, labels, self.value.value)]
+
+class Histogram():
+    # fixed buckets in shared memory, filled by the atom processes and read by the web process
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = Array('L', len(buckets) + 1)
+        self.sum = Value('d', 0.0)
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.counts.get_lock():
+            self.counts[index] += 1
+            self.sum.value += value
+
+    def samples(self, name, labels):
+        with self.counts.get_lock():
+            counts = list(self.counts)
+            total = self.sum.value
+
+        samples = []
+        cumulative = 0
+        for bound, count in zip(list(self.buckets) + [float('inf')], counts):
+            cumulative += count
+            samples.append((name + '_bucket', dict(labels, le=format_value(bound)), cumulative))
+        samples.append((name + '_sum', labels, total))
+        samples.append((name + '_count', labels, cumulative))
+        return samples
+
+class AtomMetrics():
+    def __init__(self, config, atom_index):
+        self.atom_index = atom_index
+        self.schedule_lag = Histogram(LAG_BUCKETS)
+        # a tag breakdown needs its slots up front, so only the tags listed in METRICS_TAGS get one
+        self.tag_schedule_lag = {tag : Histogram(LAG_BUCKETS) for tag in config['metrics_tags']}
+        self.chrome_startup = Histogram(LATENCY_BUCKETS)
+        self.page_load = Histogram(LATENCY_BUCKETS)
+        self.check_duration = Histogram(LATENCY_BUCKETS)
+        self.save_flush = Histogram(LATENCY_BUCKETS)
+        self.checks = Counter()
+        self.check_failures = Counter()
+        self.saved = Counter()
+
+    def observe_lag(self, web_container, lag):
+        self.schedule_lag.observe(lag)
+        for tag in web_container.setting.tags:
+            if tag in self.tag_schedule_lag:
+                self.tag_schedule_lag[tag].observe(lag)
+
+class Family():
+    def __init__(self, name, metric_type, help_text):
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples = []
+
+    def add(self, labels, value):
+        self.samples.append((self.name, labels, value))
+
+    def add_metric(self, metric, labels):
+        self.samples += metric.samples(self.name, labels)
+
+    def render(self):
+        lines = ['# HELP %s %s' % (self.name, self.help_text), '# TYPE %s %s' % (self.name, self.metric_type)]
+        for name, labels, value in self.samples:
+            lines.append('%s%s %s' % (name, format_labels(labels), format_value(value)))
+        return '\n'.join(lines)
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ['%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in labels.items()]
+    return '{' + ','.join(pairs) + '}'
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def render(selenium_scheduler):
+    families = {}
+    def family(name, metric_type, help_text):
+        if name not in families:
+            families[name] = Family(name, metric_type, help_text)
+        return families[name]
+
+    for atom_index, atom in enumerate(selenium_scheduler.atoms):
+        labels = {'atom' : str(atom_index)}
+        metrics = atom.metrics
+
+        for queue_name in ['candidates', 'nonupdated', 'commands', 'summaries']:
+            family('seleniumonitor_queue_depth', 'gauge', 'Items waiting in each atom queue.') \
+                .add(dict(labels, queue=queue_name), getattr(atom, queue_name).qsize())
+        family('seleniumonitor_watches', 'gauge', 'Watches assigned to each atom.').add(labels, selenium_scheduler.index.sizes[atom_index])
+        family('seleniumonitor_estimated_load', 'gauge', 'Estimated worker seconds per second of the watches on each atom.') \
+            .add(labels, selenium_scheduler.index.loads[atom_index])
+
+        family('seleniumonitor_schedule_lag_seconds', 'histogram', 'Time between a check being due and a fetch worker starting it.') \
+            .add_metric(metrics.schedule_lag, labels)
+        for tag, histogram in metrics.tag_schedule_lag.items():
+            family('seleniumonitor_tag_schedule_lag_seconds', 'histogram', 'Schedule lag of the watches with a tag listed in METRICS_TAGS.') \
+                .add_metric(histogram, dict(labels, tag=tag))
+        family('seleniumonitor_chrome_startup_seconds', 'histogram', 'Time to launch a Chrome session.') \
+            .add_metric(metrics.chrome_startup, labels)
+        family('seleniumonitor_page_load_seconds', 'histogram', 'Time spent in driver.get for a browser check.') \
+            .add_metric(metrics.page_load, labels)
+        family('seleniumonitor_check_duration_seconds', 'histogram', 'Wall time of a whole check in a fetch worker.') \
+            .add_metric(metrics.check_duration, labels)
+        family('seleniumonitor_save_flush_seconds', 'histogram', 'Time the saver spends committing a batch of checks.') \
+            .add_metric(metrics.save_flush, labels)
+        family('seleniumonitor_checks_total', 'counter', 'Checks finished by the fetch workers.').add_metric(metrics.checks, labels)
+        family('seleniumonitor_check_failures_total', 'counter', 'Checks that failed to fetch the page.').add_metric(metrics.check_failures, labels)
+        family('seleniumonitor_saved_checks_total', 'counter', 'Checks committed by the saver.').add_metric(metrics.saved, labels)
+
+        fetch_stats = atom.fetcher.stats()
+        for worker_index, worker in enumerate(fetch_stats['workers']):
+            family('seleniumonitor_worker_utilization', 'gauge', 'Share of uptime each fetch worker spent on checks.') \
+                .add(dict(labels, worker=str(worker_index)), worker['utilization'])
+        for name in ['http_skips', 'escalations', 'page_skips', 'notify_drops', 'errors', 'timeouts', 'restarts']:
+            family('seleniumonitor_fetch_' + name + '_total', 'counter', 'Fetcher %s count.' % (name.replace('_', ' '))) \
+                .add(labels, fetch_stats[name])
+        for name in ['hits', 'misses', 'recycles', 'startups']:
+            family('seleniumonitor_driver_pool_' + name + '_total', 'counter', 'Driver pool %s count.' % (name)) \
+                .add(labels, fetch_stats['pool'][name])
+
+    family('seleniumonitor_notify_queue_depth', 'gauge', 'Changes waiting for the notification sender.').add({}, selenium_scheduler.messages.qsize())
+    notify_stats = selenium_scheduler.sender.stats()
+    for channel in ['line_notify', 'mail']:
+        for result, value in notify_stats[channel].items():
+            family('seleniumonitor_notifications_total', 'counter', 'Notifications by channel and outcome.') \
+                .add({'channel' : channel, 'result' : result}, value)
+
+    return '\n'.join(family.render() for family in families.values()) + '\n'
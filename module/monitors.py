@@ -1,34 +1,155 @@
 import os
+import sys
 import time
+import heapq
+import queue
+import pickle
+import random
+import signal
 import shelve
 import hashlib
 import requests
-from inscriptis import get_text
-from selenium import webdriver
+import threading
+from collections import deque
 from selenium.webdriver.chrome.options import Options
-from multiprocessing import Process, Queue, Manager, Value
+from selenium.common.exceptions import WebDriverException
+from multiprocessing import Process, Queue, Manager, Value, Array, BoundedSemaphore
 from module import settings
 from module import notifies
+from module import drivers
+from module import blobs
+from module import storage
+from module import extractors
+from module import overview
+from module import differ
+from module import metrics
+from module import timings
+from module import politeness
+from module import adaptive
 
 class SeleniumScheduler():
     def __init__(self, config, global_setting):
         self.config = config
         self.global_setting = global_setting
         self.atom_nums = self.config['atom_nums']
-        self.atoms = [Atom(self.config, global_setting, atom_index) for atom_index in range(self.atom_nums)]
+        self.browser_slots = BoundedSemaphore(self.config['max_browsers'])
+        self.domain_budget = politeness.DomainBudget(self.config['domain_concurrency'], self.config['domain_spacing'], self.config['domain_slots'])
+        # NOTIFY_RATE is messages per minute for each channel
+        self.notify_buckets = {flag : notifies.TokenBucket(self.config['notify_rate'] / 60, self.config['notify_burst']) for flag in [0, 1]}
+        # one sender for every atom, so a change storm is coalesced into one digest per recipient
+        self.messages = Queue(self.config['notify_queue_size'])
+        self.sender = notifies.NotifySender(self.config, self.messages, notifies.LineNotifyNotifier(global_setting.line_notify_token), \
+                                            notifies.MailNotifier(global_setting.mails), self.notify_buckets)
+        self.atoms = [Atom(self.config, global_setting, atom_index, self.browser_slots, self.messages, self.domain_budget) \
+                      for atom_index in range(self.atom_nums)]
+        self.start_time = time.time()
+        self.index = ContainerIndex(self.atom_nums)
+        self.overview = overview.Overview()
+        self.imports = {}
+        self.blob_collector = blobs.BlobCollector(blobs.BlobStore(self.config['blobs_path']))
         self.load_atoms_data()
 
+        for atom in self.atoms:
+            threading.Thread(target=self.follow_summaries, args=(atom, ), daemon=True).start()
+        if self.config['rebalance_interval']:
+            self.balance_thread = threading.Thread(target=self.balance, daemon=True)
+            self.balance_thread.start()
+        if self.config['blob_collect_interval']:
+            self.collect_thread = threading.Thread(target=self.collect, daemon=True)
+            self.collect_thread.start()
+
     def register(self, web_container):
         index = self.min_index()
-        self.atoms[index].saver.save(web_container)
+        self.atoms[index].saver.register(web_container)
         self.atoms[index].timer.register(web_container)
+        self.index.add(web_container, index)
+        self.overview.put(overview.Summary(web_container))
+        return index
+
+    def register_many(self, web_containers):
+        # one message per atom, so the saver writes the whole batch in a single commit
+        batches = {}
+        for web_container in web_containers:
+            index = self.min_index()
+            self.index.add(web_container, index)
+            batches.setdefault(index, []).append(web_container)
+        for index, batch in batches.items():
+            self.atoms[index].saver.register_many(batch)
+            self.atoms[index].timer.register_many(batch)
+            for web_container in batch:
+                self.overview.put(overview.Summary(web_container))
 
     def min_index(self):
-        sizes = [len(atom.timer.duties) for atom in self.atoms]
-        return sizes.index(min(sizes))
+        # the atom with the least estimated work, not the fewest watches
+        loads = self.index.loads
+        return min(range(self.atom_nums), key=lambda atom_index : (loads[atom_index], self.index.sizes[atom_index]))
+
+    def balance(self):
+        while True:
+            time.sleep(self.config['rebalance_interval'])
+            self.rebalance()
+
+    def collect(self):
+        while True:
+            time.sleep(self.config['blob_collect_interval'])
+            removed = self.collect_blobs()
+            if removed:
+                print('Removed %d unreferenced blobs' % (removed))
+
+    def collect_blobs(self):
+        # blobs are shared by every atom, so the mark reads the snapshot rows of all of them
+        live_keys = set()
+        for file_name in os.listdir(self.config['atoms_path']):
+            if not (file_name.startswith('atom_') and file_name.endswith('.sqlite')):
+                continue
+            atom_store = storage.AtomStore(os.path.join(self.config['atoms_path'], file_name))
+            previous_id, previous_ref = None, None
+            for container_id, changed, text_ref, html_ref in atom_store.load_refs():
+                live_keys.add(text_ref)
+                live_keys.add(html_ref)
+                # a change keeps the diff against the snapshot right before it
+                if changed and previous_id == container_id:
+                    live_keys.add(differ.diff_key(previous_ref, text_ref))
+                previous_id, previous_ref = container_id, text_ref
+            atom_store.close()
+        return self.blob_collector.collect(live_keys)
+
+    def rebalance(self):
+        moves = 0
+        while moves < self.config['rebalance_moves']:
+            loads = self.index.loads
+            busiest = loads.index(max(loads))
+            idlest = loads.index(min(loads))
+            gap = loads[busiest] - loads[idlest]
+            if gap <= self.config['rebalance_threshold'] * (sum(loads) / self.atom_nums):
+                break
+
+            # the heaviest watch that narrows the gap without swapping which atom is busier
+            moved = False
+            for container_id in self.index.find_lighter(busiest, gap / 2):
+                web_container = self.atoms[busiest].timer.release(container_id)
+                if web_container:
+                    self.move(web_container, busiest, idlest)
+                    moved = True
+                    break
+            if not moved:
+                break
+            moves += 1
+        return moves
+
+    def move(self, web_container, source_index, target_index):
+        # released by the source timer already, history travels inside the container and the snapshots stay in the shared blob store
+        self.atoms[source_index].saver.delete(web_container)
+        self.atoms[target_index].saver.register(web_container)
+        self.atoms[target_index].timer.load([web_container])
+        self.index.add(web_container, target_index)
 
     def get_duties(self, tag=None):
-        all_duties = [web_container for atom in self.atoms for web_container in atom.timer.duties if not tag or tag in web_container.setting.tags]
+        if tag:
+            all_duties = [self.atoms[self.index.find(container_id)].timer.duties.get(container_id) for container_id in self.index.find_tag(tag)]
+            all_duties = [web_container for web_container in all_duties if web_container]
+        else:
+            all_duties = [web_container for atom in self.atoms for web_container in atom.timer.duties.values()]
         change_times = [web_container.get_latest_changed() for web_container in all_duties]
         for index, change_time in enumerate(change_times):
             if change_time == None:
@@ -37,33 +158,92 @@ class SeleniumScheduler():
         sorted_duties = [web_container for _, web_container in sorted(zip(change_times, all_duties), reverse=True)]
         return sorted_duties
 
+    def get_overview(self, tag=None, page=1, page_size=100):
+        return self.overview.page(tag, page, page_size)
+
+    def follow_summaries(self, atom):
+        # summaries of finished checks, sent by the atom's timer, drained even when nobody is browsing
+        while True:
+            summary = atom.summaries.get()
+            if self.index.find(summary.id) != None:
+                self.overview.put(summary)
+                self.index.set_load(summary.id, summary.load)
+
     def get_tags(self):
-        all_duties = self.get_duties()
-        all_tags = list(set([tag for web_container in all_duties for tag in web_container.setting.tags]))
-        return all_tags
+        return self.index.get_tags()
+
+    def get_urls(self):
+        return set(summary.url for summary in list(self.overview.summaries.values()))
+
+    def get_containers(self):
+        for atom in self.atoms:
+            for web_container in atom.timer.duties.values():
+                yield web_container
 
     def get_ids(self):
-        all_duties = self.get_duties()
-        ids = [web_container.id for web_container in all_duties]
-        return ids
+        return self.index.get_ids()
 
     def find_container(self, container_id):
-        for atom_index, atom in enumerate(self.atoms):
-            for web_container_index, web_container in enumerate(atom.timer.duties):
-                if container_id == web_container.id:
-                    return web_container, atom_index, web_container_index
-        return None
+        atom_index = self.index.find(container_id)
+        if atom_index != None:
+            web_container = self.atoms[atom_index].timer.duties.get(container_id)
+            if web_container:
+                return web_container, atom_index
+        return None, None
     
-    def update(self, web_container, atom_index, web_container_index):
-        self.atoms[atom_index].timer.update_manager_list(web_container, web_container_index, 'setting')
+    def update(self, web_container, atom_index):
+        self.index.add(web_container, atom_index)
+        self.overview.put(overview.Summary(web_container))
+        self.atoms[atom_index].timer.duties.update(web_container, 'setting')
+        self.atoms[atom_index].timer.reschedule(web_container)
         self.atoms[atom_index].saver.save(web_container)
 
+    def toggle_pause(self, container_id):
+        web_container, atom_index = self.find_container(container_id)
+        if web_container:
+            web_container.setting.pause = not web_container.setting.pause
+            self.update(web_container, atom_index)
+
     def delete(self, container_id):
-        web_container, atom_index, web_container_index = self.find_container(container_id)
-        self.atoms[atom_index].saver.delete(web_container)
-        self.atoms[atom_index].timer.delete_manager_list(web_container, web_container_index)
+        web_container, atom_index = self.find_container(container_id)
+        if web_container:
+            self.index.remove(container_id)
+            self.overview.remove(container_id)
+            self.atoms[atom_index].saver.delete(web_container)
+            self.atoms[atom_index].timer.delete(container_id)
 
     def load_atoms_data(self):
+        # watches already stored in a live atom are scheduled where they are, without rewriting them
+        for atom_index, atom in enumerate(self.atoms):
+            web_containers = atom.saver.load()
+            atom.timer.load(web_containers)
+            for web_container in web_containers:
+                self.index.add(web_container, atom_index)
+                self.overview.put(overview.Summary(web_container))
+
+        web_containers = self.load_shelves()
+        for file_path in self.stale_stores():
+            for web_container in load_store(self.config, file_path):
+                web_containers[web_container.id] = web_container
+            for suffix in ['', '-wal', '-shm']:
+                if os.path.isfile(file_path + suffix):
+                    os.remove(file_path + suffix)
+
+        for web_container in web_containers.values():
+            self.register(web_container)
+
+    def stale_stores(self):
+        # stores of atoms beyond ATOM_NUMS, their watches are moved onto the live atoms
+        file_paths = []
+        for file_name in os.listdir(self.config['atoms_path']):
+            if file_name.startswith('atom_') and file_name.endswith('.sqlite'):
+                atom_index = file_name[len('atom_') : -len('.sqlite')]
+                if atom_index.isdigit() and int(atom_index) >= self.atom_nums:
+                    file_paths.append(os.path.join(self.config['atoms_path'], file_name))
+        return file_paths
+
+    def load_shelves(self):
+        # atoms written by the shelve based saver, moved into the sqlite stores once
         web_containers = {}
         for root, dirs, files in os.walk(self.config['atoms_path']):
             for file_name in files:
@@ -73,9 +253,12 @@ class SeleniumScheduler():
                         for key in f.keys():
                             web_containers[key] = f[key]
         self.clear_atoms()
-        
-        for key, web_container in web_containers.items():
-            self.register(web_container)
+
+        blob_store = blobs.BlobStore(self.config['blobs_path'])
+        for web_container in web_containers.values():
+            web_container.config = self.config
+            web_container.migrate(blob_store)
+        return web_containers
 
     def clear_atoms(self):
         for root, dirs, files in os.walk(self.config['atoms_path']):
@@ -86,79 +269,506 @@ class SeleniumScheduler():
 
     def recheck(self, container_id=None, tag=None):
         if container_id:
-            web_container, atom_index, web_container_index = self.find_container(container_id)
-            self.atoms[atom_index].timer.recheck(web_container)
+            container_ids = [container_id]
         else:
-            web_containers = self.get_duties(tag)
-            for web_container in web_containers:
-                self.recheck(web_container.id)
+            container_ids = self.index.find_tag(tag) if tag else self.index.get_ids()
+
+        atom_ids = {}
+        for container_id in container_ids:
+            atom_index = self.index.find(container_id)
+            if atom_index != None:
+                atom_ids.setdefault(atom_index, []).append(container_id)
+        for atom_index, ids in atom_ids.items():
+            self.atoms[atom_index].timer.recheck(ids)
+
+    def close(self):
+        # stops every process of every atom, for scripts that exit without going through the signal handlers
+        for atom in self.atoms:
+            atom.close()
+        self.sender.send_process.terminate()
+        self.sender.send_process.join()
 
     def global_setting_update(self, global_setting):
         self.global_setting = global_setting
         for atom_index, atom in enumerate(self.atoms):
             self.atoms[atom_index].global_setting = global_setting
-            self.atoms[atom_index].sender.update(global_setting)
+        self.sender.update(global_setting)
+
+    def get_fetch_stats(self):
+        return [atom.fetcher.stats() for atom in self.atoms]
+
+    def get_notify_stats(self):
+        return self.sender.stats()
+
+    def get_domain_stats(self):
+        domain_stats = {}
+        for atom in self.atoms:
+            for domain, stats in atom.timer.domain_stats.items():
+                merged = domain_stats.setdefault(domain, dict(politeness.new_counts(), waiting=0, failures=0, open_atoms=0))
+                for name in ['dispatched', 'wait_time', 'deferred', 'short_circuited', 'waiting', 'failures']:
+                    merged[name] += stats[name]
+                merged['max_wait'] = max(merged['max_wait'], stats['max_wait'])
+                merged['open_atoms'] += int(stats['open'])
+
+        uptime = time.time() - self.start_time
+        for stats in domain_stats.values():
+            stats['mean_wait'] = stats['wait_time'] / stats['dispatched'] if stats['dispatched'] else 0.0
+            stats['checks_per_minute'] = stats['dispatched'] / uptime * 60 if uptime else 0.0
+        return dict(sorted(domain_stats.items(), key=lambda item : -item[1]['dispatched']))
+
+    def get_interval_report(self):
+        return adaptive.report(list(self.overview.summaries.values()))
+
+    def get_balance_stats(self):
+        balance_stats = []
+        for atom_index, atom in enumerate(self.atoms):
+            workers = atom.fetcher.stats()['workers']
+            balance_stats.append({'watches' : self.index.sizes[atom_index], 'load' : self.index.loads[atom_index], 'workers' : len(workers), \
+                                  'utilization' : sum(worker['utilization'] for worker in workers) / len(workers)})
+        return balance_stats
+
+class ContainerIndex():
+    def __init__(self, atom_nums):
+        # lives in the web process, so lookups never have to walk the atoms
+        self.locations = {}
+        self.tags = {}
+        self.container_tags = {}
+        self.sizes = [0] * atom_nums
+        # estimated worker seconds per second, from check cost and interval
+        self.container_loads = {}
+        self.loads = [0.0] * atom_nums
+        self.lock = threading.Lock()
+
+    def add(self, web_container, atom_index):
+        with self.lock:
+            self.discard(web_container.id)
+            self.locations[web_container.id] = atom_index
+            self.container_tags[web_container.id] = list(web_container.setting.tags)
+            self.sizes[atom_index] += 1
+            self.container_loads[web_container.id] = web_container.get_load()
+            self.loads[atom_index] += self.container_loads[web_container.id]
+            for tag in set(web_container.setting.tags):
+                self.tags.setdefault(tag, set()).add(web_container.id)
+
+    def remove(self, container_id):
+        with self.lock:
+            self.discard(container_id)
+
+    def discard(self, container_id):
+        atom_index = self.locations.pop(container_id, None)
+        if atom_index == None:
+            return
+        self.sizes[atom_index] -= 1
+        self.loads[atom_index] -= self.container_loads.pop(container_id, 0.0)
+        # watches saved before set_tags dropped duplicates may still repeat a tag
+        for tag in set(self.container_tags.pop(container_id, [])):
+            ids = self.tags.get(tag)
+            if ids == None:
+                continue
+            ids.discard(container_id)
+            if not ids:
+                del self.tags[tag]
+
+    def set_load(self, container_id, load):
+        with self.lock:
+            atom_index = self.locations.get(container_id)
+            if atom_index != None:
+                self.loads[atom_index] += load - self.container_loads[container_id]
+                self.container_loads[container_id] = load
+
+    def find(self, container_id):
+        return self.locations.get(container_id)
+
+    def find_lighter(self, atom_index, limit):
+        with self.lock:
+            loads = [(load, container_id) for container_id, load in self.container_loads.items() \
+                     if self.locations[container_id] == atom_index and 0 < load <= limit]
+        return [container_id for load, container_id in sorted(loads, reverse=True)]
+
+    def find_tag(self, tag):
+        return list(self.tags.get(tag, []))
+
+    def get_tags(self):
+        return list(self.tags.keys())
+
+    def get_ids(self):
+        return list(self.locations.keys())
 
 class Atom():
-    def __init__(self, config, global_setting, atom_index):
+    def __init__(self, config, global_setting, atom_index, browser_slots, messages, domain_budget):
         self.config = config
         self.global_setting = global_setting
 
         self.candidates = Queue()
         self.nonupdated = Queue()
-        self.completed = Queue()
-        self.messages = Queue()
+        self.commands = Queue()
+        self.messages = messages
+        self.summaries = Queue()
 
         self.atom_index = atom_index
+        self.metrics = metrics.AtomMetrics(self.config, self.atom_index)
 
-        self.timer = Timer(self.config, self.candidates, self.completed)
-        self.fetcher = WebFetcher(self.config, self.candidates, self.nonupdated, self.messages)
-        self.saver = Saver(self.config, self.nonupdated, self.completed, self.atom_index)
+        self.timer = Timer(self.config, self.candidates, self.commands, self.summaries, self.metrics, domain_budget)
+        self.fetcher = WebFetcher(self.config, self.candidates, self.nonupdated, self.commands, self.messages, browser_slots, self.metrics, \
+                                  self.atom_index)
+        self.saver = Saver(self.config, self.nonupdated, self.commands, self.atom_index, self.metrics)
 
-        self.sender = notifies.NotifySender(self.messages, notifies.LineNotifyNotifier(global_setting.line_notify_token), notifies.MailNotifier(global_setting.mails))
+    def close(self):
+        processes = [self.timer.clock_process, self.fetcher.supervise_process, self.saver.store_process]
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+        self.timer.manager.shutdown()
+
+# containers compacted between two looks at the saver's queue
+COMPACT_CHUNK = 50
+# how long an idle fetch worker waits on the queue before looking at the pool and the stop flag
+WORKER_POLL = 1.0
+# bytes kept per worker for the id of the watch it is checking
+CONTAINER_ID_SIZE = 64
 
 class WebFetcher():
-    def __init__(self, config, candidates, nonupdated, messages):
+    def __init__(self, config, candidates, nonupdated, commands, messages, browser_slots, metrics, atom_index):
         self.config = config
         self.candidates = candidates
         self.nonupdated = nonupdated
+        self.commands = commands
         self.messages = messages
+        self.metrics = metrics
+        self.atom_index = atom_index
+        self.workers = self.config['fetch_workers']
 
         self.chrome_options = Options()
         self.chrome_options.add_argument('--headless')
         self.chrome_options.add_argument('--no-sandbox')
         self.chrome_options.add_argument('--disable-dev-shm-usage')
+        if self.config['user_agent']:
+            self.chrome_options.add_argument('--user-agent=' + self.config['user_agent'])
+        # eager returns at DOMContentLoaded, without waiting for images, frames and late scripts
+        self.chrome_options.page_load_strategy = self.config['page_load_strategy']
+
+        self.pool = drivers.DriverPool(self.config, self.chrome_options, browser_slots, self.metrics)
+
+        # per worker counters, shared with the web process
+        self.start_time = time.time()
+        self.in_flight = Array('i', self.workers)
+        self.started = Array('d', self.workers)
+        self.in_flight_ids = Array('c', self.workers * CONTAINER_ID_SIZE)
+        self.checks = Array('i', self.workers)
+        self.busy_time = Array('d', self.workers)
+        self.http_skips = Value('i', 0)
+        self.escalations = Value('i', 0)
+        self.page_skips = Value('i', 0)
+        self.notify_drops = Value('i', 0)
+        self.errors = Value('i', 0)
+        self.timeouts = Value('i', 0)
+        self.restarts = Value('i', 0)
+        self.fetch_pid = Value('i', 0)
+
+        # forked now, while the web process has no threads yet, the supervisor forks every fetch process after that
+        self.supervise_process = Process(target=self.supervise)
+        self.supervise_process.start()
 
-        self.fetch_process = Process(target=self.get_page)
-        self.fetch_process.start()
-    
     def __del__(self):
-        self.fetch_process.terminate()
-    
-    def get_page(self):
+        self.supervise_process.terminate()
+
+    def supervise(self):
+        signal.signal(signal.SIGTERM, self.stop)
         while True:
-            web_container = self.candidates.get(True)
-            driver = webdriver.Chrome(self.config['driver_path'], options=self.chrome_options)
-            driver.get(web_container.setting.url)
-            # update
-            changed = web_container.update(driver.page_source)
+            self.fetch_process = Process(target=self.run)
+            self.fetch_process.start()
+            self.fetch_pid.value = self.fetch_process.pid
+            self.fetch_process.join()
+
+            print('Fetch process of atom %d exited with %s, restarting it' % (self.atom_index, self.fetch_process.exitcode))
+            self.kill_browsers()
+            self.commands.put(('requeue', self.lost_checks()))
+            self.pool.reclaim()
+            self.count(self.restarts)
+            time.sleep(self.config['supervise_interval'])
+
+    def stop(self, signum, frame):
+        self.fetch_process.terminate()
+        self.fetch_process.join(10)
+        self.kill_browsers()
+        sys.exit(0)
+
+    def kill_browsers(self):
+        # chromedriver and chrome run in the fetch process's group, once it is gone nothing else would stop them
+        try:
+            os.killpg(self.fetch_process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def lost_checks(self):
+        # the watches the dead fetch process was checking, they go back to the timer
+        container_ids = []
+        for worker_index in range(self.workers):
+            if self.in_flight[worker_index]:
+                container_ids.append(self.in_flight_ids[worker_index * CONTAINER_ID_SIZE : (worker_index + 1) * CONTAINER_ID_SIZE] \
+                                     .rstrip(b'\0').decode('utf8'))
+            self.in_flight[worker_index] = 0
+        return container_ids
+
+    def shutdown(self, signum, frame):
+        self.pool.close()
+        sys.exit(0)
+
+    def run(self):
+        os.setpgrp()
+        signal.signal(signal.SIGTERM, self.shutdown)
+        self.http_session = requests.Session()
+        self.http_session.mount('http://', requests.adapters.HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers))
+        self.http_session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=self.workers, pool_maxsize=self.workers))
+        if self.config['user_agent']:
+            self.http_session.headers['User-Agent'] = self.config['user_agent']
+
+        # only touched inside the fetch process
+        self.local = threading.local()
+        self.report_lock = threading.Lock()
+        self.generations = [0] * self.workers
+        self.current = {}
+        self.stopping = False
+        self.threads = []
+        for worker_index in range(self.workers):
+            self.in_flight[worker_index] = 0
+            self.threads.append(threading.Thread(target=self.get_page, args=(worker_index, ), daemon=True))
+            self.threads[-1].start()
+        self.watch()
+
+    def watch(self):
+        # a worker stuck past CHECK_TIMEOUT is abandoned and its check reported as failed, then the process exits,
+        # only the supervisor killing its group frees the hung browser and its slot
+        while not self.stopping:
+            time.sleep(1)
+            for worker_index in range(self.workers):
+                if self.in_flight[worker_index] and time.time() - self.started[worker_index] > self.config['check_timeout']:
+                    self.abandon(worker_index)
+        self.drain()
+        sys.exit(1)
+
+    def drain(self):
+        # the other workers finish what they hold and leave the queue alone, a process killed inside get would keep its lock
+        deadline = time.time() + self.config['check_timeout']
+        for worker_index, thread in enumerate(self.threads):
+            if self.generations[worker_index] == 0:
+                thread.join(max(0.0, deadline - time.time()))
+
+    def abandon(self, worker_index):
+        with self.report_lock:
+            if not self.in_flight[worker_index]:
+                return
+            self.generations[worker_index] += 1
+            self.in_flight[worker_index] = 0
+            web_container, stopwatch = self.current.pop(worker_index)
+            self.count(self.timeouts)
+            self.metrics.check_failures.inc()
+            self.report(web_container, stopwatch, 'failed', 'Check timed out after %d seconds' % (self.config['check_timeout']))
+            self.stopping = True
+
+    def get_page(self, worker_index):
+        self.local.worker_index = worker_index
+        self.local.generation = self.generations[worker_index]
+        while not self.stopping and not self.abandoned():
+            try:
+                due, web_container = self.candidates.get(True, WORKER_POLL)
+            except queue.Empty:
+                self.pool.reap()
+                continue
+
+            start_time = time.time()
+            # measured here, so the time spent queued behind busy workers is part of the lag
+            self.metrics.observe_lag(web_container, start_time - due)
+            self.local.stopwatch = timings.Stopwatch()
+            self.current[worker_index] = (web_container, self.local.stopwatch)
+            self.in_flight_ids[worker_index * CONTAINER_ID_SIZE : (worker_index + 1) * CONTAINER_ID_SIZE] = \
+                web_container.id.encode('utf8')[ : CONTAINER_ID_SIZE].ljust(CONTAINER_ID_SIZE, b'\0')
+            self.started[worker_index] = start_time
+            self.in_flight[worker_index] = 1
+            try:
+                self.fetch(web_container)
+            except Exception as e:
+                # whatever goes wrong, the watch goes back to its timer instead of staying in flight
+                print(e)
+                self.count(self.errors)
+                self.metrics.check_failures.inc()
+                self.finish(web_container, self.local.stopwatch, 'failed', '%s: %s' % (type(e).__name__, e))
+            if self.abandoned():
+                # abandoned by the watchdog, its check was reported already
+                return
+            check_time = time.time() - start_time
+            self.checks[worker_index] += 1
+            self.busy_time[worker_index] += check_time
+            self.metrics.checks.inc()
+            self.metrics.check_duration.observe(check_time)
+
+    def fetch(self, web_container):
+        stopwatch = self.local.stopwatch
+        fetch_mode = web_container.setting.fetch_mode
+        page_source = None
+        # the validators of this response, kept only once the whole check went through
+        http_cache = None
+        if fetch_mode != 'browser':
+            with stopwatch.stage('precheck'):
+                state, page_source, http_cache = self.precheck(web_container)
+            if state == 'unchanged':
+                self.count(self.http_skips)
+                web_container.touch()
+                self.finish(web_container, stopwatch, 'checked', http_cache=http_cache)
+                return
+            elif state == 'failed' and fetch_mode == 'http':
+                self.metrics.check_failures.inc()
+                self.finish(web_container, stopwatch, 'failed', page_source)
+                return
+            elif fetch_mode == 'auto':
+                self.count(self.escalations)
+                page_source = None
+
+        text = None
+        if page_source == None:
+            setting = web_container.setting
+            try:
+                session_time = time.time()
+                with self.pool.session() as driver:
+                    stopwatch.add('session', session_time)
+                    drivers.prepare(driver, self.config, setting)
+                    load_time = time.time()
+                    driver.get(setting.url)
+                    stopwatch.add('navigate', load_time)
+                    self.metrics.page_load.observe(stopwatch.stages['navigate'])
+                    with stopwatch.stage('settle'):
+                        drivers.wait_ready(driver, self.config, setting)
+                    if setting.browser_extract:
+                        # only the selected text crosses over, and nothing at all when its hash is unchanged
+                        previous_hash = web_container.page_hash if len(web_container.history) else None
+                        with stopwatch.stage('browser_extract'):
+                            web_container.page_hash, text = extractors.extract_in_browser(driver, setting, previous_hash)
+                        if text == None:
+                            self.count(self.page_skips)
+                            web_container.touch()
+                            self.finish(web_container, stopwatch, 'checked', http_cache=http_cache)
+                            return
+                    if setting.capture_html or not setting.browser_extract:
+                        with stopwatch.stage('page_source'):
+                            page_source = driver.page_source
+            except WebDriverException as e:
+                print(e)
+                self.metrics.check_failures.inc()
+                self.finish(web_container, stopwatch, 'failed', '%s: %s' % (type(e).__name__, e.msg or ''))
+                return
+
+        # a hung call that finally returned after the watchdog gave up, its snapshot would never be saved
+        if self.abandoned():
+            return
+        changed = web_container.update(page_source, text, stopwatch)
+        self.finish(web_container, stopwatch, 'checked', http_cache=http_cache, changed=changed)
+
+    def abandoned(self):
+        return self.local.generation != self.generations[self.local.worker_index]
+
+    def finish(self, web_container, stopwatch, action, error=False, http_cache=None, changed=False):
+        with self.report_lock:
+            # a worker the watchdog gave up on has had its check reported already
+            if self.abandoned():
+                return
+            # notified only together with the report, so a change is never announced without its snapshot
             if changed:
-                self.messages.put(notifies.LineNotifyMessage(self.config, web_container))
-                self.messages.put(notifies.MailMessage(self.config, web_container))
-            driver.close()
+                self.notify(notifies.LineNotifyMessage(self.config, web_container))
+                self.notify(notifies.MailMessage(self.config, web_container))
+            self.report(web_container, stopwatch, action, error, http_cache)
+            self.in_flight[self.local.worker_index] = 0
+            self.current.pop(self.local.worker_index, None)
+
+    def report(self, web_container, stopwatch, action, error=False, http_cache=None):
+        # a failed browser step must not leave validators behind that make the next check skip the change
+        if action == 'checked' and http_cache:
+            web_container.http_cache = http_cache
+        web_container.setting.last_error = error if action == 'failed' else False
+        web_container.timings = timings.add_record(web_container.timings, stopwatch.record(action), self.config['timing_history'])
+        self.nonupdated.put((action, web_container))
+
+    def precheck(self, web_container):
+        url = web_container.setting.url
+        # validators only hold for the url and filters the latest snapshot was taken with
+        filters = extractors.filter_key(web_container.setting)
+        http_cache = web_container.http_cache
+        if http_cache.get('url') != url or http_cache.get('filters') != filters or not len(web_container.history):
+            http_cache = {}
+        headers = dict(web_container.setting.headers or {})
+        if http_cache.get('etag'):
+            headers['If-None-Match'] = http_cache['etag']
+        if http_cache.get('last_modified'):
+            headers['If-Modified-Since'] = http_cache['last_modified']
+
+        try:
+            response = self.http_session.get(url, headers=headers, timeout=self.config['http_timeout'])
+        except requests.RequestException as e:
+            print(e)
+            return 'failed', '%s: %s' % (type(e).__name__, e), None
+
+        if response.status_code == 304 and http_cache:
+            return 'unchanged', None, http_cache
+        if response.status_code >= 400:
+            return 'failed', 'HTTP %d' % (response.status_code), None
+
+        body_hash = hashlib.md5(response.content).hexdigest()
+        validators = {'url' : url, 'filters' : filters, 'etag' : response.headers.get('ETag'), \
+                      'last_modified' : response.headers.get('Last-Modified'), 'body_hash' : body_hash}
+        if body_hash == http_cache.get('body_hash'):
+            return 'unchanged', None, validators
 
-            self.nonupdated.put(web_container)
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = response.apparent_encoding
+        return 'changed', response.text, validators
+
+    def notify(self, message):
+        # the queue is bounded, a stuck sender must not stall the fetch workers
+        try:
+            self.messages.put_nowait(message)
+        except queue.Full:
+            self.count(self.notify_drops)
+
+    def count(self, counter):
+        with counter.get_lock():
+            counter.value += 1
+
+    def stats(self):
+        uptime = time.time() - self.start_time
+        workers = [{'in_flight' : self.in_flight[index], 'checks' : self.checks[index], 'busy_time' : self.busy_time[index], \
+                    'utilization' : self.busy_time[index] / uptime if uptime else 0.0} for index in range(self.workers)]
+        return {'queue_depth' : self.candidates.qsize(), 'workers' : workers, 'pool' : self.pool.stats(), \
+                'http_skips' : self.http_skips.value, 'escalations' : self.escalations.value, 'page_skips' : self.page_skips.value, \
+                'notify_drops' : self.notify_drops.value, 'errors' : self.errors.value, 'timeouts' : self.timeouts.value, \
+                'restarts' : self.restarts.value}
 
 class Timer():
-    def __init__(self, config, candidates, completed, polling_interval=0.5):
+    def __init__(self, config, candidates, commands, summaries, metrics, domain_budget):
         self.config = config
         self.candidates = candidates
-        self.completed = completed
+        self.commands = commands
+        self.summaries = summaries
+        self.metrics = metrics
+        self.domain_budget = domain_budget
+        self.jitter = self.config['schedule_jitter']
+        # answers to release commands, one at a time
+        self.releases = Queue()
+        self.release_lock = threading.Lock()
 
         self.manager = Manager()
-        self.duties = self.manager.list()
-        self.duties_lock = self.manager.Lock()
-        self.polling_interval = polling_interval
+        self.duties = Registry(self.manager)
+        self.domain_stats = self.manager.dict()
+
+        # only touched inside the clock process
+        self.due_heap = []
+        self.schedules = {}
+        # due checks held back by their domain's budget, served round robin across domains
+        self.waiting = {}
+        self.rotation = deque()
+        self.domain_counts = {}
+        # consecutive failures per domain, each atom's timer trips its own breaker
+        self.breakers = {}
+        self.stats_time = 0.0
 
         self.clock_process = Process(target=self.clock)
         self.clock_process.start()
@@ -168,72 +778,328 @@ class Timer():
 
     def clock(self):
         while True:
-            time.sleep(self.polling_interval)
-            self.check_completed()
             self.check_candidates()
+            if time.time() >= self.stats_time:
+                self.publish_stats()
+                self.stats_time = time.time() + politeness.STATS_INTERVAL
+
+            wake_times = [self.domain_budget.ready_time(domain) for domain in self.waiting]
+            if self.due_heap:
+                wake_times.append(self.due_heap[0][0])
+            timeout = max(0.0, min(wake_times) - time.time()) if wake_times else None
+            try:
+                action, payload = self.commands.get(True, timeout)
+            except queue.Empty:
+                continue
+            self.handle(action, payload)
+
+    def handle(self, action, payload):
+        if action == 'completed':
+            self.check_completed(payload)
+        elif action == 'schedule':
+            self.schedule(*payload)
+        elif action == 'load':
+            for container_id, interval, pause, due, last_checked in payload:
+                self.schedule(container_id, interval, pause, due)
+                self.schedules[container_id]['last_checked'] = last_checked
+        elif action == 'recheck':
+            for container_id in payload:
+                self.check_now(container_id)
+        elif action == 'delete':
+            self.schedules.pop(payload, None)
+        elif action == 'requeue':
+            for container_id in payload:
+                self.check_lost(container_id)
+        elif action == 'release':
+            self.releases.put(self.check_release(payload))
 
-    def go_check(self, web_container):
+    def go_check(self, web_container, due):
         web_container.time_value = float('inf')
-        self.candidates.put(web_container)
+        self.candidates.put((due, web_container))
 
-    def recheck(self, web_container):
-        if web_container.time_value != float('inf'):
-            self.go_check(web_container)
+    def push(self, container_id, due):
+        schedule = self.schedules[container_id]
+        schedule['due'] = due
+        if due != None and not schedule['pause']:
+            heapq.heappush(self.due_heap, (due, container_id))
 
-    def check_completed(self):
-        queue_size = self.completed.qsize()
-        for _ in range(queue_size):
-            try:
-                web_container = self.completed.get(False)
-            except:
-                return
+    def next_due(self, schedule, last_checked):
+        interval = schedule['interval']
+        return last_checked + interval + random.uniform(0, self.jitter * interval)
 
-            index = self.find_index(web_container.id)
-            web_container.time_value = time.time()
-            self.update_manager_list(web_container, index, 'history')
-            self.update_manager_list(web_container, index, 'time_value')
-            
-    def find_index(self, id):
-        id_index = None
-        for index, web_container in enumerate(self.duties):
-            if web_container.id == id:
-                id_index = index
-                break
-        return id_index
+    def schedule(self, container_id, interval, pause, due):
+        schedule = self.schedules.setdefault(container_id, {'due' : None, 'last_checked' : None, 'in_flight' : False})
+        # next_due and backoff run in the clock process, a None here would stop every watch of the atom
+        schedule['interval'] = interval or self.config['default_interval']
+        schedule['pause'] = pause
+        if schedule['in_flight']:
+            return
+
+        if due == None:
+            due = self.next_due(schedule, schedule['last_checked']) if schedule['last_checked'] != None else time.time()
+        self.push(container_id, due)
+
+    def check_now(self, container_id):
+        schedule = self.schedules.get(container_id)
+        if schedule and not schedule['in_flight']:
+            self.push(container_id, time.time())
+
+    def check_completed(self, web_container):
+        # the url the check was started with, even when the watch was edited or deleted since
+        domain = politeness.domain_of(web_container.setting.url)
+        error = web_container.setting.last_error
+        self.domain_budget.release(domain)
+        self.trip(domain, error)
+        web_container.time_value = time.time()
+        schedule = self.schedules.get(web_container.id)
+        stored = self.duties.update(web_container, 'history', 'time_value', 'http_cache', 'page_hash', 'timings') if schedule else None
+        if not stored:
+            self.schedules.pop(web_container.id, None)
+            return
+
+        schedule['failures'] = schedule.get('failures', 0) + 1 if error else 0
+        if stored.setting.last_error != error:
+            stored.setting.last_error = error
+            self.duties.update(stored, 'setting')
+
+        # the stored setting, it may have been edited while the check ran
+        effective_interval = adaptive.effective_interval(stored, self.config) if stored.setting.adaptive else None
+        if effective_interval != stored.effective_interval:
+            stored.effective_interval = effective_interval
+            self.duties.update(stored, 'effective_interval')
+        self.summaries.put(overview.Summary(stored))
+
+        schedule['in_flight'] = False
+        schedule['last_checked'] = web_container.time_value
+        # an adaptive watch runs on its derived interval until its settings are saved again
+        if effective_interval:
+            schedule['interval'] = effective_interval
+        if schedule['failures']:
+            self.push(web_container.id, web_container.time_value + self.backoff(schedule))
+        else:
+            self.push(web_container.id, self.next_due(schedule, web_container.time_value))
+
+    def backoff(self, schedule):
+        # a failing watch waits twice as long after every failure, up to FAILURE_BACKOFF_MAX
+        interval = schedule['interval']
+        # capped before multiplying, a float overflows past 2 ** 1024 and would stop the clock process
+        exponent = min(schedule['failures'] - 1, 32)
+        return min(interval * 2 ** exponent, max(interval, self.config['failure_backoff_max']))
+
+    def trip(self, domain, error):
+        if not error:
+            self.breakers.pop(domain, None)
+            return
+        breaker = self.breakers.setdefault(domain, {'failures' : 0, 'open_until' : 0.0, 'trial_until' : 0.0})
+        breaker['failures'] += 1
+        breaker['trial_until'] = 0.0
+        if breaker['failures'] >= self.config['breaker_threshold']:
+            breaker['open_until'] = time.time() + self.config['breaker_cooldown']
+
+    def blocked_until(self, domain, time_value):
+        # an open breaker holds back every watch of its domain, after the cooldown a single check goes through as a trial
+        breaker = self.breakers.get(domain)
+        if not breaker or breaker['failures'] < self.config['breaker_threshold']:
+            return None
+        blocked_until = max(breaker['open_until'], breaker['trial_until'])
+        if blocked_until > time_value:
+            return blocked_until
+        breaker['trial_until'] = time_value + self.config['check_timeout']
+        return None
+
+    def check_release(self, container_id):
+        # decided here and not in the web process, a check dispatched meanwhile would report to a timer that dropped the watch
+        schedule = self.schedules.get(container_id)
+        web_container = self.duties.get(container_id)
+        if not schedule or schedule['in_flight'] or not web_container:
+            return None
+        self.schedules.pop(container_id)
+        self.duties.delete(container_id)
+        return web_container
+
+    def check_lost(self, container_id):
+        # the check died with its fetch process, nothing will ever report it
+        schedule = self.schedules.get(container_id)
+        web_container = self.duties.get(container_id)
+        if not schedule or not schedule['in_flight'] or not web_container:
+            return
+        self.domain_budget.release(politeness.domain_of(web_container.setting.url))
+        schedule['in_flight'] = False
+        self.push(container_id, time.time())
 
     def check_candidates(self):
-        for index, web_container in enumerate(self.duties):
-            time_value = time.time()
-            if time_value - web_container.time_value >= web_container.setting.interval and not web_container.setting.pause:
-                self.go_check(web_container)
-                self.update_manager_list(web_container, index, 'time_value')
+        time_value = time.time()
+        while self.due_heap and self.due_heap[0][0] <= time_value:
+            due, container_id = heapq.heappop(self.due_heap)
+            schedule = self.schedules.get(container_id)
+            # entries left behind by a reschedule, pause or delete are skipped here
+            if not schedule or schedule['due'] != due or schedule['pause'] or schedule['in_flight']:
+                continue
+
+            web_container = self.duties.get(container_id)
+            if not web_container:
+                self.schedules.pop(container_id, None)
+                continue
+
+            domain = politeness.domain_of(web_container.setting.url)
+            blocked_until = self.blocked_until(domain, time_value)
+            if blocked_until:
+                self.domain_counts.setdefault(domain, politeness.new_counts())['short_circuited'] += 1
+                self.push(container_id, blocked_until + random.uniform(0, 0.1 * self.config['breaker_cooldown']))
+                continue
+
+            schedule['in_flight'] = True
+            schedule['due'] = None
+            if domain not in self.waiting:
+                self.waiting[domain] = deque()
+                self.rotation.append(domain)
+            self.waiting[domain].append((due, time_value, web_container))
+
+        self.dispatch()
+
+    def dispatch(self):
+        # one check per domain and round, so a domain with hundreds of due watches can't starve the rest
+        progress = True
+        while self.rotation and progress:
+            progress = False
+            for _ in range(len(self.rotation)):
+                domain = self.rotation.popleft()
+                waiting = self.waiting[domain]
+                due, queued_time, web_container = waiting[0]
+                schedule = self.schedules.get(web_container.id)
+                if not schedule or schedule['pause']:
+                    # deleted or paused while it waited
+                    waiting.popleft()
+                    if schedule:
+                        schedule['in_flight'] = False
+                    progress = True
+                elif self.domain_budget.acquire(domain):
+                    waiting.popleft()
+                    self.start(domain, due, queued_time, web_container)
+                    progress = True
+
+                if waiting:
+                    self.rotation.append(domain)
+                else:
+                    del self.waiting[domain]
+
+    def start(self, domain, due, queued_time, web_container):
+        time_value = time.time()
+        counts = self.domain_counts.setdefault(domain, politeness.new_counts())
+        wait_time = time_value - queued_time
+        counts['dispatched'] += 1
+        counts['wait_time'] += wait_time
+        counts['max_wait'] = max(counts['max_wait'], wait_time)
+        if wait_time >= 0.01:
+            counts['deferred'] += 1
+
+        self.go_check(web_container, due)
+        self.duties.update(web_container, 'time_value')
+
+    def publish_stats(self):
+        time_value = time.time()
+        stats = {}
+        for domain in set(self.domain_counts) | set(self.waiting) | set(self.breakers):
+            breaker = self.breakers.get(domain, {'failures' : 0, 'open_until' : 0.0})
+            stats[domain] = dict(self.domain_counts.get(domain, politeness.new_counts()), waiting=len(self.waiting.get(domain, [])), \
+                                 failures=breaker['failures'], open=breaker['open_until'] > time_value)
+        self.domain_stats.update(stats)
 
     def register(self, web_container):
-        self.duties_lock.acquire()
-        self.go_check(web_container)
-        self.duties.append(web_container)
-        self.duties_lock.release()
-
-    def update_manager_list(self, web_container, index, attribute):
-        self.duties_lock.acquire()
-        tempt = list(self.duties)
-        setattr(tempt[index], attribute, getattr(web_container, attribute))
-        self.duties[ : ] = tempt
-        self.duties_lock.release()
-
-    def delete_manager_list(self, web_container, index):
-        self.duties_lock.acquire()
-        tempt = list(self.duties)
-        del tempt[index]
-        self.duties[ : ] = tempt
-        self.duties_lock.release()
+        self.duties.add(web_container)
+        self.reschedule(web_container, time.time())
+
+    def load(self, web_containers):
+        time_value = time.time()
+        schedules = []
+        for web_container in web_containers:
+            web_container.effective_interval = adaptive.effective_interval(web_container, self.config) if web_container.setting.adaptive else None
+            interval = web_container.get_interval()
+            latest_history = web_container.get_latest_history()
+            last_checked = latest_history.time_stamp if latest_history else None
+            web_container.time_value = last_checked or time_value
+
+            # overdue watches are spread out instead of all firing at boot
+            due = last_checked + interval if last_checked else time_value
+            if due < time_value:
+                due = time_value + random.uniform(0, min(interval, self.config['startup_spread']))
+            schedules.append((web_container.id, interval, web_container.setting.pause, due, last_checked))
+
+        self.duties.add_many(web_containers)
+        self.commands.put(('load', schedules))
+
+    def register_many(self, web_containers):
+        # first checks are spread over each watch's interval instead of all firing now
+        time_value = time.time()
+        schedules = [(web_container.id, web_container.get_fixed_interval(), web_container.setting.pause, \
+                      time_value + random.uniform(0, web_container.get_fixed_interval()), None) for web_container in web_containers]
+        self.duties.add_many(web_containers)
+        self.commands.put(('load', schedules))
+
+    def reschedule(self, web_container, due=None):
+        self.commands.put(('schedule', (web_container.id, web_container.get_fixed_interval(), web_container.setting.pause, due)))
+
+    def recheck(self, container_ids):
+        self.commands.put(('recheck', container_ids))
+
+    def release(self, container_id):
+        # the watch leaves this atom, or None when a check of it is running
+        with self.release_lock:
+            self.commands.put(('release', container_id))
+            return self.releases.get()
+
+    def delete(self, container_id):
+        self.duties.delete(container_id)
+        self.commands.put(('delete', container_id))
+
+class Registry():
+    def __init__(self, manager):
+        # keyed by container id, so every write only pickles the container it touches
+        self.containers = manager.dict()
+        self.lock = manager.Lock()
+
+    def __len__(self):
+        return len(self.containers)
+
+    def __contains__(self, container_id):
+        return container_id in self.containers
+
+    def get(self, container_id):
+        return self.containers.get(container_id)
+
+    def values(self):
+        return self.containers.values()
+
+    def add(self, web_container):
+        self.containers[web_container.id] = web_container
+
+    def add_many(self, web_containers):
+        self.containers.update({web_container.id : web_container for web_container in web_containers})
+
+    def update(self, web_container, *attributes):
+        with self.lock:
+            stored = self.containers.get(web_container.id)
+            if stored == None:
+                return None
+            for attribute in attributes:
+                setattr(stored, attribute, getattr(web_container, attribute))
+            self.containers[web_container.id] = stored
+        return stored
+
+    def delete(self, container_id):
+        with self.lock:
+            self.containers.pop(container_id, None)
 
 class Saver():
-    def __init__(self, config, nonupdated, completed, atom_index):
+    def __init__(self, config, nonupdated, commands, atom_index, metrics):
         self.config = config
         self.nonupdated = nonupdated
-        self.completed = completed
-        self.file_path = os.path.join(self.config['atoms_path'], 'atom_' + str(atom_index))
+        self.commands = commands
+        self.metrics = metrics
+        self.file_path = os.path.join(self.config['atoms_path'], 'atom_' + str(atom_index) + '.sqlite')
+        self.batch_size = self.config['save_batch_size']
+        self.flush_interval = self.config['save_flush_interval']
+        self.compact_interval = self.config['compact_interval']
 
         self.store_process = Process(target=self.store)
         self.store_process.start()
@@ -242,48 +1108,177 @@ class Saver():
         self.store_process.terminate()
     
     def store(self):
+        # the store process is the only writer of this atom's file
+        self.atom_store = storage.AtomStore(self.file_path)
+        checked = []
+        dirty = False
+        flush_time = None
+        compact_time = time.time() + self.compact_interval
+        compact_ids = None
+
         while True:
-            web_container = self.nonupdated.get(True)
-            self.save(web_container)
-            self.completed.put(web_container)
+            timeout = flush_time if dirty else compact_time
+            try:
+                action, payload = self.nonupdated.get(True, max(0.0, timeout - time.time()))
+                self.handle(action, payload)
+                if not dirty:
+                    dirty = True
+                    flush_time = time.time() + self.flush_interval
+                if action in ['checked', 'failed']:
+                    checked.append(payload)
+            except queue.Empty:
+                pass
+
+            if dirty and (len(checked) >= self.batch_size or time.time() >= flush_time):
+                commit_time = time.time()
+                self.atom_store.commit()
+                commit_time = time.time() - commit_time
+                self.metrics.save_flush.observe(commit_time)
+                self.metrics.saved.inc(len(checked))
+                for web_container in checked:
+                    # the batch commit is shared, every check in it waited for all of it
+                    if web_container.timings:
+                        stages = web_container.timings[-1]['stages']
+                        stages['save'] = commit_time
+                        stages['total'] += commit_time
+                    self.commands.put(('completed', web_container))
+                checked = []
+                dirty = False
+
+            # a pass is done in chunks, so checks keep being saved while it runs
+            if not dirty and time.time() >= compact_time:
+                if compact_ids == None:
+                    self.atom_store.delete_orphans()
+                    compact_ids = self.atom_store.container_ids()
+                self.compact(compact_ids[ : COMPACT_CHUNK])
+                compact_ids = compact_ids[COMPACT_CHUNK : ]
+                if not compact_ids:
+                    self.atom_store.checkpoint()
+                    compact_ids = None
+                    compact_time = time.time() + self.compact_interval
+
+    def handle(self, action, payload):
+        if action in ['checked', 'failed']:
+            # timings, validators, hash and last error go to disk in the same batch as the snapshot,
+            # unless the watch was deleted after the check was picked up
+            if self.atom_store.update_container(payload) and action == 'checked':
+                self.atom_store.append_snapshot(payload.id, payload.get_latest_history())
+        elif action == 'register':
+            self.atom_store.save_container(payload)
+            self.atom_store.save_history(payload)
+        elif action == 'register_many':
+            for web_container in payload:
+                self.atom_store.save_container(web_container)
+        elif action == 'save':
+            self.atom_store.save_container(payload)
+        elif action == 'delete':
+            self.atom_store.delete_container(payload)
+
+    def compact(self, container_ids):
+        # drop the rows of checks that were folded away by later unchanged checks
+        blob_store = blobs.BlobStore(self.config['blobs_path'])
+        for container_id in container_ids:
+            rows = self.atom_store.load_snapshots(container_id)
+            page_datas = [PageData.from_record(blob_store, row[1 : ]) for row in rows]
+            kept = set(map(id, replay_history(page_datas, self.config['max_snapshots'])))
+            self.atom_store.delete_snapshots([row[0] for row, page_data in zip(rows, page_datas) if id(page_data) not in kept])
+        self.atom_store.commit()
+
+    def register(self, web_container):
+        self.nonupdated.put(('register', web_container))
+
+    def register_many(self, web_containers):
+        self.nonupdated.put(('register_many', web_containers))
 
     def save(self, web_container):
-        container_id = web_container.id
-        with shelve.open(self.file_path) as f:
-            f[container_id] = web_container
-        self.completed.put(web_container)
+        self.nonupdated.put(('save', web_container))
 
     def delete(self, web_container):
-        container_id = web_container.id
-        with shelve.open(self.file_path) as f:
-            del f[container_id]
+        self.nonupdated.put(('delete', web_container.id))
+
+    def load(self):
+        return load_store(self.config, self.file_path)
+
+def load_store(config, file_path):
+    # boot only reads rows, snapshot content stays in the blob store until a page asks for it
+    atom_store = storage.AtomStore(file_path)
+    blob_store = blobs.BlobStore(config['blobs_path'])
+    records = {}
+    for row in atom_store.load_all_snapshots():
+        records.setdefault(row[0], []).append(PageData.from_record(blob_store, row[1 : ]))
+
+    web_containers = []
+    for container_id, data in atom_store.load_containers():
+        web_container = pickle.loads(data)
+        web_container.config = config
+        web_container.history = replay_history(records.get(container_id, []), config['max_snapshots'])
+        web_containers.append(web_container)
+    atom_store.close()
+    return web_containers
+
+def fold_history(history, page_data, max_snapshots):
+    # an unchanged check replaces the latest snapshot, a changed one is appended
+    if len(history) and history[-1].checksum != page_data.checksum:
+        history.append(page_data)
+    else:
+        if len(history) >= 2:
+            history[-1] = page_data
+        else:
+            history.append(page_data)
+
+    if len(history) > max_snapshots:
+        history = history[1 : ]
+    return history
+
+def replay_history(page_datas, max_snapshots):
+    history = []
+    for page_data in page_datas:
+        history = fold_history(history, page_data, max_snapshots)
+    return history
 
 class WebContainer():
     def __init__(self, config, url, interval):
         self.config = config
         self.id = str(time.time())
         self.time_value = time.time()
-        self.setting = settings.ContainerSetting(url=url, interval=interval)
+        self.setting = settings.ContainerSetting(url=url, interval=interval, fetch_mode=config['fetch_mode'], browser_extract=config['browser_extract'])
         self.history = []
+        self.http_cache = {}
+        self.page_hash = None
+        self.timings = []
+        self.effective_interval = None
+
+    def __setstate__(self, state):
+        # containers pickled by older versions miss the newer fields
+        self.http_cache = {}
+        self.page_hash = None
+        self.timings = []
+        self.effective_interval = None
+        self.__dict__.update(state)
     
-    def update(self, html):
+    def update(self, html, text=None, stopwatch=None):
         changed = False
-        latest_data = PageData(html)
+        stopwatch = stopwatch or timings.Stopwatch()
+        latest_data = PageData(blobs.BlobStore(self.config['blobs_path']), extractors.make_extractor(self.setting), html, text, self.setting.capture_html, \
+                               stopwatch)
         
         if len(self.history) and self.get_latest_history().checksum != latest_data.checksum:
             latest_data.changed = True
-            self.history.append(latest_data)
             changed = True
-        else:
-            if len(self.history) >= 2:
-                self.history[-1] = latest_data
-            else:
-                self.history.append(latest_data)
+            with stopwatch.stage('diff'):
+                differ.save_diff(latest_data.blob_store, self.get_latest_history(), latest_data)
         
-        if len(self.history) > self.config['max_snapshots']:
-            self.history = self.history[1 : ]
+        self.history = fold_history(self.history, latest_data, self.config['max_snapshots'])
         return changed
 
+    def touch(self):
+        # an unchanged page seen without the browser, refresh the latest snapshot's time
+        latest_history = self.get_latest_history()
+        latest_data = PageData.from_record(latest_history.blob_store, latest_history.to_record())
+        latest_data.time_stamp = time.time()
+        latest_data.changed = False
+        self.history = fold_history(self.history, latest_data, self.config['max_snapshots'])
+
     def get_encoding(self):
         self.encoding = requests.get(self.setting.url).encoding
     
@@ -300,6 +1295,27 @@ class WebContainer():
                 return page_data.time_stamp
         return None
 
+    def get_diff(self, previous_index=None):
+        return differ.get_diff(self.config['blobs_path'], self.get_previous_history(previous_index), self.get_latest_history())
+
+    def get_change_excerpt(self):
+        return differ.make_excerpt(self.get_diff()) if len(self.history) >= 2 else ''
+
+    def get_fixed_interval(self):
+        # a blank interval on the edit page means the default one
+        return self.setting.interval or self.config['default_interval']
+
+    def get_interval(self):
+        return self.effective_interval or self.get_fixed_interval()
+
+    def get_load(self):
+        if self.setting.pause:
+            return 0.0
+        return timings.estimate_cost(self.timings, self.setting.fetch_mode) / self.get_interval()
+
+    def get_timing_summary(self):
+        return timings.summarize(self.timings)
+
     def get_time_stamps(self):
         return [page_data.time_stamp for page_data in self.history]
 
@@ -309,13 +1325,51 @@ class WebContainer():
                 return index
         return None
 
+    def migrate(self, blob_store):
+        for page_data in self.history:
+            page_data.migrate(blob_store)
+
 class PageData():
-    def __init__(self, html):
-        self.html = html
-        self.text = get_text(self.html)
-        self.checksum = self.count_checksum(self.text)
+    def __init__(self, blob_store, extractor, html=None, text=None, capture_html=False, stopwatch=None):
+        stopwatch = stopwatch or timings.Stopwatch()
+        with stopwatch.stage('extract'):
+            text = extractor.extract(html) if text == None else text
+            filtered_text = extractor.filter(text)
+        self.blob_store = blob_store
+        # ignored lines stay in the snapshot but never count as a change
+        with stopwatch.stage('hash'):
+            self.checksum = self.count_checksum(filtered_text)
+        with stopwatch.stage('store'):
+            self.text_ref = self.blob_store.put(text, self.checksum if filtered_text is text else None)
+            self.html_ref = self.blob_store.put(html) if capture_html and html != None else None
         self.time_stamp = time.time()
         self.changed = False
 
+    @property
+    def text(self):
+        return self.blob_store.get(self.text_ref)
+
+    @property
+    def html(self):
+        return self.blob_store.get(self.html_ref) if self.html_ref else None
+
     def count_checksum(self, text):
         return hashlib.md5((text).encode('utf8')).hexdigest()
+
+    def to_record(self):
+        return (self.checksum, self.time_stamp, int(self.changed), self.text_ref, self.html_ref)
+
+    @classmethod
+    def from_record(cls, blob_store, record):
+        page_data = cls.__new__(cls)
+        page_data.blob_store = blob_store
+        page_data.checksum, page_data.time_stamp, changed, page_data.text_ref, page_data.html_ref = record
+        page_data.changed = bool(changed)
+        return page_data
+
+    def migrate(self, blob_store):
+        # snapshots saved before the blob store kept html and text inline
+        if 'text' in self.__dict__:
+            self.blob_store = blob_store
+            self.text_ref = self.blob_store.put(self.__dict__.pop('text'), self.checksum)
+            self.html_ref = self.blob_store.put(self.__dict__.pop('html'))
@@ -1,13 +1,28 @@
-import os
 import abc
+import copy
+import time
+import queue
+import smtplib
 import requests
+import threading
+from email.message import EmailMessage
+from requests.adapters import HTTPAdapter
 from multiprocessing import Process, Queue, Manager, Value
 
+class NotifyError(Exception):
+    pass
+
 class NotifySender():
-    def __init__(self, messages, line_notify_sender, mail_sender):
+    def __init__(self, config, messages, line_notify_sender, mail_sender, buckets):
+        self.config = config
         self.messages = messages
         self.line_notify_sender = line_notify_sender
         self.mail_sender = mail_sender
+        self.buckets = buckets
+        self.window = self.config['notify_window']
+        self.channels = {0 : 'line_notify', 1 : 'mail'}
+        self.counters = {channel : {name : Value('i', 0) for name in ['sent', 'failed', 'retries', 'dropped', 'coalesced', 'rate_limited']} \
+                         for channel in self.channels.values()}
         
         self.send_process = Process(target=self.send)
         self.send_process.start()
@@ -16,20 +31,163 @@ class NotifySender():
         self.send_process.terminate()
 
     def send(self):
+        # every channel has its own bounded queue and workers, so slow SMTP never holds up LINE
+        notifiers = {0 : self.line_notify_sender, 1 : self.mail_sender}
+        channel_queues = {}
+        for flag, notifier in notifiers.items():
+            notifier.open(self.config)
+            channel_queues[flag] = queue.Queue(self.config['notify_queue_size'])
+            for _ in range(self.config['notify_workers']):
+                threading.Thread(target=self.deliver, args=(notifier, channel_queues[flag]), daemon=True).start()
+
+        # changes wait in a batch per channel and recipient until its window closes
+        batches = {}
+        while True:
+            flush_times = [batch.open_time + self.window for batch in batches.values()]
+            timeout = max(0.0, min(flush_times) - time.time()) if flush_times else None
+            try:
+                self.collect(batches, self.messages.get(True, timeout))
+            except queue.Empty:
+                pass
+            self.flush(batches, channel_queues)
+
+    def collect(self, batches, message):
+        for recipient in self.recipients(message):
+            key = (message.flag, recipient)
+            if key not in batches:
+                batches[key] = Batch()
+            batches[key].add(message)
+
+    def recipients(self, message):
+        if message.flag == 1:
+            mails = list(self.mail_sender.mails) + list(message.web_container.setting.notification_emails)
+            return list(dict.fromkeys(mail for mail in mails if mail))
+        return ['']
+
+    def flush(self, batches, channel_queues):
+        now = time.time()
+        for key, batch in list(batches.items()):
+            flag, recipient = key
+            if now < batch.open_time + self.window:
+                continue
+            if not len(batch.messages):
+                self.count(flag, 'coalesced', batch.received)
+                del batches[key]
+                continue
+            if not self.buckets[flag].take():
+                # over the rate limit, the batch stays open and takes in the next changes too
+                self.count(flag, 'rate_limited')
+                batch.open_time = now - self.window + self.buckets[flag].wait_time()
+                continue
+
+            del batches[key]
+            self.count(flag, 'coalesced', batch.received - 1)
+            message = batch.make_message(self.config)
+            if flag == 1:
+                message = copy.copy(message)
+                message.mails = [recipient]
+            try:
+                channel_queues[flag].put_nowait(message)
+            except queue.Full:
+                self.count(flag, 'dropped')
+
+    def deliver(self, notifier, channel_queue):
         while True:
-            message = self.messages.get(True)
-            if message.flag == 0:
-                self.line_notify_sender.notify(message)
-            elif message.flag == 1:
-                self.mail_sender.notify(message)
+            message = channel_queue.get(True)
+            delay = self.config['notify_backoff']
+            for attempt in range(self.config['notify_retries'] + 1):
+                try:
+                    sent = notifier.notify(message)
+                    break
+                except Exception as e:
+                    # whatever a send raises, the worker has to stay alive for the next message
+                    print(e)
+                    sent = False
+                    if attempt < self.config['notify_retries']:
+                        self.count(message.flag, 'retries')
+                        time.sleep(delay)
+                        delay *= 2
+
+            # None means the channel has nowhere to send to
+            if sent != None:
+                self.count(message.flag, 'sent' if sent else 'failed')
+
+    def count(self, flag, name, value=1):
+        counter = self.counters[self.channels[flag]][name]
+        with counter.get_lock():
+            counter.value += value
+
+    def stats(self):
+        stats = {channel : {name : counter.value for name, counter in counters.items()} for channel, counters in self.counters.items()}
+        stats['queue_depth'] = self.messages.qsize()
+        return stats
     
     def update(self, global_setting):
         self.line_notify_sender.update_token(global_setting.line_notify_token)
         self.mail_sender.update_mails(global_setting.mails)
 
+class Batch():
+    def __init__(self):
+        self.open_time = time.time()
+        self.received = 0
+        self.messages = {}
+        self.checksums = {}
+
+    def add(self, message):
+        # a watch is sent once per batch with its latest change
+        self.received += 1
+        web_container = message.web_container
+        before = web_container.history[-2].checksum if len(web_container.history) >= 2 else None
+        after = web_container.history[-1].checksum if len(web_container.history) else None
+
+        if web_container.id not in self.messages:
+            self.messages[web_container.id] = message
+            self.checksums[web_container.id] = before
+        elif after != None and after == self.checksums[web_container.id]:
+            # flapped back to what the recipient already knows about
+            del self.messages[web_container.id]
+            del self.checksums[web_container.id]
+        else:
+            self.messages[web_container.id] = message
+
+    def make_message(self, config):
+        messages = list(self.messages.values())
+        if len(messages) == 1:
+            return messages[0]
+        if messages[0].flag == 0:
+            return LineNotifyDigest(config, messages)
+        return MailDigest(config, messages)
+
+class TokenBucket():
+    # in shared memory, so the web process can read it while the sender takes from it
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = Value('d', burst)
+        self.updated = Value('d', time.time())
+
+    def take(self):
+        if self.rate <= 0:
+            return True
+        with self.tokens.get_lock():
+            now = time.time()
+            self.tokens.value = min(self.burst, self.tokens.value + (now - self.updated.value) * self.rate)
+            self.updated.value = now
+            if self.tokens.value < 1:
+                return False
+            self.tokens.value -= 1
+            return True
+
+    def wait_time(self):
+        with self.tokens.get_lock():
+            return max(0.0, (1 - self.tokens.value) / self.rate)
+
 class Notifier():
     def __init__(self, token=None):
         self.token = token
+
+    def open(self, config):
+        self.config = config
     
     @abc.abstractmethod
     def notify(self, message):
@@ -38,25 +196,37 @@ class Notifier():
 class LineNotifyNotifier(Notifier):
     def __init__(self, token):
         self.manager = Manager()
-        self.token = self.manager.list()
+        self.token = self.manager.list([''])
         self.update_token(token)
+
+    def open(self, config):
+        # one pooled session shared by the channel workers
+        super().open(config)
+        self.notify_api_url = config['line_notify_url']
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config['notify_workers'])
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
     def notify(self, message):
-        if self.token:
-            payload = {'message': message.format_message()}
-            r = requests.post(self.notify_api_url, headers = self.headers, params = payload)
-            return r.status_code == 200
-        else:
-            return False
+        token = self.token[0]
+        if not token:
+            return None
+
+        headers = {
+            "Authorization": "Bearer " + token, 
+            "Content-Type" : "application/x-www-form-urlencoded"
+        }
+        payload = {'message': message.format_message()}
+        r = self.session.post(self.notify_api_url, headers=headers, data=payload, timeout=self.config['notify_timeout'])
+        if r.status_code == 429 or r.status_code >= 500:
+            raise NotifyError('Line Notify responded %d' % (r.status_code))
+        return r.status_code == 200
 
     def update_token(self, token):
+        token = token or ''
         if '*' not in token:
-            self.token = [token]
-            self.notify_api_url = 'https://notify-api.line.me/api/notify'
-            self.headers = {
-                "Authorization": "Bearer " + self.token[0], 
-                "Content-Type" : "application/x-www-form-urlencoded"
-            }
+            self.token[0] = token
 
 class MailNotifier(Notifier):
     def __init__(self, mails):
@@ -64,14 +234,45 @@ class MailNotifier(Notifier):
         self.mails = self.manager.list()
         self.update_mails(mails)
 
+    def open(self, config):
+        # each worker keeps its own SMTP connection open between messages
+        super().open(config)
+        self.local = threading.local()
+
+    def connect(self):
+        smtp = smtplib.SMTP(self.config['smtp_host'], self.config['smtp_port'], timeout=self.config['notify_timeout'])
+        if self.config['smtp_user']:
+            smtp.ehlo()
+            if smtp.has_extn('starttls'):
+                smtp.starttls()
+                smtp.ehlo()
+            smtp.login(self.config['smtp_user'], self.config['smtp_password'])
+        return smtp
+
     def notify(self, message):
-        part_command = message.format_message()
-        commands = [part_command + mail for mail in list(self.mails)]
-        for command in commands:
-            try:
-                os.system(command)
-            except Exception as e:
+        mails = getattr(message, 'mails', None) or list(self.mails)
+        if not mails:
+            return None
+
+        # one message to all recipients instead of one command per recipient
+        email_message = message.format_message(self.config['smtp_sender'], mails)
+        try:
+            if getattr(self.local, 'smtp', None) == None:
+                self.local.smtp = self.connect()
+            self.local.smtp.send_message(email_message)
+        except smtplib.SMTPRecipientsRefused as e:
+            print(e)
+            return False
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code >= 500:
                 print(e)
+                return False
+            raise
+        except (smtplib.SMTPException, OSError):
+            # a dropped connection is opened again on the next attempt
+            self.local.smtp = None
+            raise
+        return True
 
     def update_mails(self, mails):
         self.mails[ : ] = mails
@@ -81,6 +282,7 @@ class Message():
         self.flag = flag
         self.config = config
         self.web_container = web_container
+        self.excerpt = web_container.get_change_excerpt()
         self.make_text()
     
     @abc.abstractmethod
@@ -115,7 +317,10 @@ class LineNotifyMessage(Message):
             message += 'Url : ' + self.title + '\n'
         if self.content:
             message += 'Diff : ' + self.content + '\n'
-        return message
+        if self.excerpt:
+            message += self.excerpt + '\n'
+        # Line Notify takes at most 1000 characters
+        return message[ : 1000]
 
 class MailMessage(Message):
     def __init__(self, config, web_container):
@@ -131,8 +336,45 @@ class MailMessage(Message):
         diff_url = 'http://' + self.config['ip'] + ':' + str(self.config['port']) + '/diff/'
         diff_url += str(self.web_container.id)
         content = origin_url + '\n' + diff_url + '\n'
+        if self.excerpt:
+            content += '\n' + self.excerpt + '\n'
         self.set_text(title, content)
 
+    def format_message(self, sender, mails):
+        email_message = EmailMessage()
+        email_message['Subject'] = self.title
+        email_message['From'] = sender
+        email_message['To'] = ', '.join(mails)
+        email_message.set_content(self.content)
+        return email_message
+
+class LineNotifyDigest(LineNotifyMessage):
+    def __init__(self, config, messages):
+        self.flag = 0
+        self.config = config
+        self.messages = messages
+
     def format_message(self):
-        part_command = 'echo "' + self.content + '" | mail -s "' + self.title + '" '
-        return part_command
+        message = '\n%d watches changed\n' % (len(self.messages))
+        for index, changed_message in enumerate(self.messages):
+            part = changed_message.format_message()
+            # Line Notify takes at most 1000 characters
+            if len(message) + len(part) > 900:
+                if index == 0:
+                    # a long first excerpt is cut instead of leaving the digest without any watch
+                    message += part[ : 900 - len(message)].rstrip('\n') + '\n'
+                    index += 1
+                if index < len(self.messages):
+                    message += '\n... and %d more\n' % (len(self.messages) - index)
+                break
+            message += part
+        return message
+
+class MailDigest(MailMessage):
+    def __init__(self, config, messages):
+        self.flag = 1
+        self.config = config
+        self.messages = messages
+        title = '[Hospital Notifier] : %d watches changed' % (len(self.messages))
+        content = '\n'.join([changed_message.web_container.setting.title + '\n' + changed_message.content for changed_message in self.messages])
+        self.set_text(title, content)
@@ -0,0 +1,69 @@
+import time
+import bisect
+import hashlib
+import threading
+
+class Summary():
+    def __init__(self, web_container):
+        self.id = web_container.id
+        self.title = web_container.setting.title
+        self.url = web_container.setting.url
+        self.tags = list(web_container.setting.tags)
+        self.pause = web_container.setting.pause
+        self.last_error = web_container.setting.last_error
+        self.last_checked = web_container.time_value
+        self.last_changed = web_container.get_latest_changed()
+        self.snapshots = len(web_container.history)
+        self.load = web_container.get_load()
+        self.adaptive = web_container.setting.adaptive
+        self.fixed_interval = web_container.get_fixed_interval()
+        self.interval = web_container.get_interval()
+
+    def sort_key(self):
+        # same order as before, never changed first and then the most recently changed
+        change_time = self.last_changed if self.last_changed != None else float('inf')
+        return (-change_time, self.id)
+
+class Overview():
+    def __init__(self):
+        self.summaries = {}
+        self.order = []
+        self.version = 0
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+
+    def put(self, summary):
+        with self.lock:
+            self.discard(summary.id)
+            self.summaries[summary.id] = summary
+            bisect.insort(self.order, summary.sort_key())
+            self.version += 1
+
+    def remove(self, container_id):
+        with self.lock:
+            self.discard(container_id)
+            self.version += 1
+
+    def discard(self, container_id):
+        summary = self.summaries.pop(container_id, None)
+        if summary:
+            index = bisect.bisect_left(self.order, summary.sort_key())
+            del self.order[index]
+
+    def get(self, container_id):
+        return self.summaries.get(container_id)
+
+    def page(self, tag=None, page=1, page_size=100):
+        with self.lock:
+            if tag:
+                ids = [container_id for _, container_id in self.order if tag in self.summaries[container_id].tags]
+            else:
+                ids = [container_id for _, container_id in self.order]
+            pages = max(1, (len(ids) + page_size - 1) // page_size)
+            page = min(max(1, page), pages)
+            summaries = [self.summaries[container_id] for container_id in ids[(page - 1) * page_size : page * page_size]]
+        return summaries, page, pages
+
+    def etag(self, *args):
+        key = '%s:%s:%s' % (self.start_time, self.version, args)
+        return hashlib.md5(key.encode('utf8')).hexdigest()
@@ -0,0 +1,51 @@
+import time
+import zlib
+from urllib.parse import urlparse
+from multiprocessing import Array, Lock
+
+# how often a timer looks again at a domain that is at its concurrency limit
+DOMAIN_POLL = 0.5
+# how often a timer publishes its per domain stats to the web process
+STATS_INTERVAL = 5.0
+
+def new_counts():
+    return {'dispatched' : 0, 'wait_time' : 0.0, 'max_wait' : 0.0, 'deferred' : 0, 'short_circuited' : 0}
+
+def domain_of(url):
+    return (urlparse(url).hostname or '').lower()
+
+class DomainBudget():
+    # shared by the timers of every atom, domains hash into a fixed number of slots so it fits in shared memory
+    def __init__(self, concurrency, spacing, slots):
+        self.concurrency = concurrency
+        self.spacing = spacing
+        self.slots = slots
+        self.in_flight = Array('i', slots, lock=False)
+        self.next_time = Array('d', slots, lock=False)
+        self.lock = Lock()
+
+    def slot(self, domain):
+        # a collision only makes two domains share a budget, never lets one exceed it
+        return zlib.crc32(domain.encode('utf8')) % self.slots
+
+    def acquire(self, domain, time_value=None):
+        time_value = time_value or time.time()
+        slot = self.slot(domain)
+        with self.lock:
+            if self.in_flight[slot] >= self.concurrency or time_value < self.next_time[slot]:
+                return False
+            self.in_flight[slot] += 1
+            self.next_time[slot] = time_value + self.spacing
+        return True
+
+    def release(self, domain):
+        slot = self.slot(domain)
+        with self.lock:
+            self.in_flight[slot] = max(0, self.in_flight[slot] - 1)
+
+    def ready_time(self, domain):
+        slot = self.slot(domain)
+        with self.lock:
+            if self.in_flight[slot] >= self.concurrency:
+                return time.time() + DOMAIN_POLL
+            return self.next_time[slot]
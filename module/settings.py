@@ -41,24 +41,39 @@ class GlobalSetting():
             f[self.key] = self
 
 class ContainerSetting():
-    def __init__(self, url, interval):
+    def __init__(self, url, interval, fetch_mode='browser', browser_extract=False):
         self.url = url
         self.interval = interval
+        self.fetch_mode = fetch_mode
+        self.browser_extract = browser_extract
+        self.capture_html = False
+        self.fetch_profile = ''
+        self.wait_selector = ''
+        self.headers = {}
         self.tags = []
         self.title = url
         self.css_selector = ''
         self.ignore_css_selector = ''
-        self.ignore_text = ''
+        self.ignore_text = []
         self.notification_emails = []
+        self.adaptive = False
+        self.min_interval = None
+        self.max_interval = None
         self.pause = False
         self.url_as_title = True
         self.last_error = False
 
+    def __setstate__(self, state):
+        # settings pickled by older versions miss the newer fields
+        self.__init__(state['url'], state['interval'])
+        self.__dict__.update(state)
+
     def set_interval(self, interval):
         self.interval = interval
 
     def set_tags(self, tags):
-        self.tags = [tag for tag in tags if tag]
+        # order kept, a tag typed twice is stored once
+        self.tags = list(dict.fromkeys(tag for tag in tags if tag))
 
     def set_emails(self, emails):
         self.notification_emails = emails
@@ -68,13 +83,38 @@ class ContainerSetting():
         if self.url_as_title:
             self.title = self.url
     
+    def set_filters(self, css_selector, ignore_css_selector, ignore_text):
+        self.css_selector = css_selector
+        self.ignore_css_selector = ignore_css_selector
+        self.ignore_text = ignore_text
+
+    def set_fetch_mode(self, fetch_mode, browser_extract, capture_html):
+        self.fetch_mode = fetch_mode
+        self.browser_extract = browser_extract
+        self.capture_html = capture_html
+
+    def set_fetch_profile(self, fetch_profile, wait_selector, headers):
+        self.fetch_profile = fetch_profile
+        self.wait_selector = wait_selector
+        self.headers = headers
+
+    def set_adaptive(self, adaptive, min_interval, max_interval):
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
     def set_title(self, title):
         self.title = title
         self.url_as_title = not self.title
 
-    def update(self, url, interval, title, tags, emails):
+    def update(self, url, interval, title, tags, emails, fetch_mode, browser_extract, capture_html, css_selector, ignore_css_selector, ignore_text, \
+               adaptive=False, min_interval=None, max_interval=None, fetch_profile='', wait_selector='', headers=None):
         self.set_url(url)
         self.set_interval(interval)
         self.set_title(title)
         self.set_tags(tags)
-        self.set_emails(emails)
\ No newline at end of file
+        self.set_emails(emails)
+        self.set_fetch_mode(fetch_mode, browser_extract, capture_html)
+        self.set_filters(css_selector, ignore_css_selector, ignore_text)
+        self.set_adaptive(adaptive, min_interval, max_interval)
+        self.set_fetch_profile(fetch_profile, wait_selector, headers or {})
\ No newline at end of file
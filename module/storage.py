@@ -0,0 +1,73 @@
+import copy
+import pickle
+import sqlite3
+
+class AtomStore():
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(self.file_path, timeout=30)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS containers (id TEXT PRIMARY KEY, data BLOB)')
+        # one small append only row per check, the snapshot content itself lives in the blob store
+        self.connection.execute('CREATE TABLE IF NOT EXISTS snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, container_id TEXT, ' \
+                                'checksum TEXT, time_stamp REAL, changed INTEGER, text_ref TEXT, html_ref TEXT)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS snapshots_container ON snapshots (container_id, id)')
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def commit(self):
+        self.connection.commit()
+
+    def save_container(self, web_container):
+        stripped = copy.copy(web_container)
+        stripped.history = []
+        self.connection.execute('INSERT OR REPLACE INTO containers (id, data) VALUES (?, ?)', (web_container.id, pickle.dumps(stripped)))
+
+    def save_history(self, web_container):
+        self.connection.execute('DELETE FROM snapshots WHERE container_id = ?', (web_container.id, ))
+        for page_data in web_container.history:
+            self.append_snapshot(web_container.id, page_data)
+
+    def append_snapshot(self, container_id, page_data):
+        self.connection.execute('INSERT INTO snapshots (container_id, checksum, time_stamp, changed, text_ref, html_ref) VALUES (?, ?, ?, ?, ?, ?)', \
+                                (container_id, ) + page_data.to_record())
+
+    def delete_container(self, container_id):
+        self.connection.execute('DELETE FROM containers WHERE id = ?', (container_id, ))
+        self.connection.execute('DELETE FROM snapshots WHERE container_id = ?', (container_id, ))
+
+    def update_container(self, web_container):
+        # only rewrites a row that is still there, returns whether it was
+        stripped = copy.copy(web_container)
+        stripped.history = []
+        return self.connection.execute('UPDATE containers SET data = ? WHERE id = ?', (pickle.dumps(stripped), web_container.id)).rowcount > 0
+
+    def delete_orphans(self):
+        # rows of watches deleted while one of their checks was still on the way
+        self.connection.execute('DELETE FROM snapshots WHERE container_id NOT IN (SELECT id FROM containers)')
+
+    def load_containers(self):
+        return self.connection.execute('SELECT id, data FROM containers').fetchall()
+
+    def load_snapshots(self, container_id):
+        return self.connection.execute('SELECT id, checksum, time_stamp, changed, text_ref, html_ref FROM snapshots ' \
+                                       'WHERE container_id = ? ORDER BY id', (container_id, )).fetchall()
+
+    def load_all_snapshots(self):
+        return self.connection.execute('SELECT container_id, checksum, time_stamp, changed, text_ref, html_ref FROM snapshots ' \
+                                       'ORDER BY container_id, id').fetchall()
+
+    def load_refs(self):
+        return self.connection.execute('SELECT container_id, changed, text_ref, html_ref FROM snapshots ORDER BY container_id, id')
+
+    def container_ids(self):
+        return [row[0] for row in self.connection.execute('SELECT DISTINCT container_id FROM snapshots')]
+
+    def delete_snapshots(self, snapshot_ids):
+        self.connection.executemany('DELETE FROM snapshots WHERE id = ?', [(snapshot_id, ) for snapshot_id in snapshot_ids])
+
+    def checkpoint(self):
+        self.connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
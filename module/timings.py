@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+
+# seconds of worker time a check is assumed to take before any was measured
+DEFAULT_COSTS = {'browser' : 5.0, 'auto' : 2.0, 'http' : 0.5}
+
+STAGES = ['precheck', 'session', 'navigate', 'settle', 'browser_extract', 'page_source', 'extract', 'hash', 'store', 'diff', 'save', 'total']
+
+class Stopwatch():
+    # one per check, filled by the fetch worker and finished by the saver
+    def __init__(self):
+        self.start_time = time.time()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start_time = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, start_time)
+
+    def add(self, name, start_time):
+        self.stages[name] = self.stages.get(name, 0.0) + time.time() - start_time
+
+    def record(self, result):
+        return {'time_stamp' : self.start_time, 'result' : result, 'stages' : dict(self.stages, total=time.time() - self.start_time)}
+
+def add_record(timings, record, size):
+    timings.append(record)
+    return timings[-size : ] if len(timings) > size else timings
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def estimate_cost(timings, fetch_mode):
+    if not timings:
+        return DEFAULT_COSTS.get(fetch_mode, DEFAULT_COSTS['browser'])
+    return percentile([record['stages']['total'] for record in timings], 0.5)
+
+def summarize(timings):
+    stages = {}
+    for record in timings:
+        for name, value in record['stages'].items():
+            stages.setdefault(name, []).append(value)
+
+    summary = []
+    for name in STAGES + sorted(set(stages) - set(STAGES)):
+        if name in stages:
+            values = stages[name]
+            summary.append({'stage' : name, 'count' : len(values), 'p50' : percentile(values, 0.5), 'p95' : percentile(values, 0.95), \
+                            'max' : max(values)})
+    return summary
@@ -69,8 +69,9 @@ def init_config(config):
     config['ip'] = get_ip()
     config['atoms_path'] = os.path.join(config['store_path'], 'atoms/')
     config['global_setting_path'] = os.path.join(config['store_path'], 'global_setting')
+    config['blobs_path'] = os.path.join(config['store_path'], 'blobs')
 
-    check_dirs = ['store_path', 'atoms_path', 'global_setting_path']
+    check_dirs = ['store_path', 'atoms_path', 'global_setting_path', 'blobs_path']
     for check_dir in check_dirs:
         if not os.path.isdir(config[check_dir]):
             os.mkdir(config[check_dir])
@@ -86,10 +87,82 @@ def load_env():
         port = int(os.getenv('PORT'))
         user_agent = os.getenv('USER_AGENT')
         line_notify_token = os.getenv('LINE_NOTIFY_TOKEN')
+        line_notify_url = os.getenv('LINE_NOTIFY_URL', 'https://notify-api.line.me/api/notify')
+        fetch_workers = int(os.getenv('FETCH_WORKERS', 1))
+        max_browsers = int(os.getenv('MAX_BROWSERS', atom_nums * fetch_workers))
+        driver_pool_size = int(os.getenv('DRIVER_POOL_SIZE', fetch_workers))
+        driver_max_pages = int(os.getenv('DRIVER_MAX_PAGES', 50))
+        driver_idle_timeout = float(os.getenv('DRIVER_IDLE_TIMEOUT', 60))
+        schedule_jitter = float(os.getenv('SCHEDULE_JITTER', 0.1))
+        save_batch_size = int(os.getenv('SAVE_BATCH_SIZE', 100))
+        save_flush_interval = float(os.getenv('SAVE_FLUSH_INTERVAL', 1))
+        compact_interval = float(os.getenv('COMPACT_INTERVAL', 600))
+        blob_collect_interval = float(os.getenv('BLOB_COLLECT_INTERVAL', 3600))
+        startup_spread = float(os.getenv('STARTUP_SPREAD', 300))
+        fetch_mode = os.getenv('FETCH_MODE', 'browser')
+        http_timeout = float(os.getenv('HTTP_TIMEOUT', 30))
+        browser_extract = os.getenv('BROWSER_EXTRACT', 'false').lower() == 'true'
+        overview_page_size = int(os.getenv('OVERVIEW_PAGE_SIZE', 100))
+        preview_page_size = int(os.getenv('PREVIEW_PAGE_SIZE', 262144))
+        diff_page_size = int(os.getenv('DIFF_PAGE_SIZE', 200))
+        notify_workers = int(os.getenv('NOTIFY_WORKERS', 2))
+        notify_queue_size = int(os.getenv('NOTIFY_QUEUE_SIZE', 1000))
+        notify_timeout = float(os.getenv('NOTIFY_TIMEOUT', 10))
+        notify_retries = int(os.getenv('NOTIFY_RETRIES', 3))
+        notify_backoff = float(os.getenv('NOTIFY_BACKOFF', 1))
+        notify_window = float(os.getenv('NOTIFY_WINDOW', 30))
+        notify_rate = float(os.getenv('NOTIFY_RATE', 10))
+        notify_burst = int(os.getenv('NOTIFY_BURST', 20))
+        smtp_host = os.getenv('SMTP_HOST', 'localhost')
+        smtp_port = int(os.getenv('SMTP_PORT', 25))
+        smtp_user = os.getenv('SMTP_USER', '')
+        smtp_password = os.getenv('SMTP_PASSWORD', '')
+        smtp_sender = os.getenv('SMTP_SENDER', 'seleniumonitor@localhost')
+        metrics_tags = os.getenv('METRICS_TAGS', '').split()
+        timing_history = int(os.getenv('TIMING_HISTORY', 50))
+        rebalance_interval = float(os.getenv('REBALANCE_INTERVAL', 300))
+        rebalance_threshold = float(os.getenv('REBALANCE_THRESHOLD', 0.2))
+        rebalance_moves = int(os.getenv('REBALANCE_MOVES', 20))
+        import_batch_size = int(os.getenv('IMPORT_BATCH_SIZE', 500))
+        domain_concurrency = int(os.getenv('DOMAIN_CONCURRENCY', 2))
+        domain_spacing = float(os.getenv('DOMAIN_SPACING', 0.5))
+        domain_slots = int(os.getenv('DOMAIN_SLOTS', 4096))
+        fetch_profile = os.getenv('FETCH_PROFILE', 'light')
+        blocked_urls = os.getenv('BLOCKED_URLS', '').split()
+        page_load_strategy = os.getenv('PAGE_LOAD_STRATEGY', 'eager')
+        page_load_timeout = float(os.getenv('PAGE_LOAD_TIMEOUT', 30))
+        wait_timeout = float(os.getenv('WAIT_TIMEOUT', 10))
+        check_timeout = float(os.getenv('CHECK_TIMEOUT', 120))
+        failure_backoff_max = float(os.getenv('FAILURE_BACKOFF_MAX', 3600))
+        breaker_threshold = int(os.getenv('BREAKER_THRESHOLD', 5))
+        breaker_cooldown = float(os.getenv('BREAKER_COOLDOWN', 300))
+        supervise_interval = float(os.getenv('SUPERVISE_INTERVAL', 5))
+        adaptive_factor = float(os.getenv('ADAPTIVE_FACTOR', 4))
+        adaptive_min_interval = float(os.getenv('ADAPTIVE_MIN_INTERVAL', 60))
+        adaptive_max_interval = float(os.getenv('ADAPTIVE_MAX_INTERVAL', 86400))
     except Exception as e:
         print('Make sure you have .env file and format is correct !!!')
         print(e)
         raise
     
     return {'driver_path' : driver_path, 'atom_nums' : atom_nums, 'default_interval' : default_interval, 'max_snapshots' : max_snapshots, \
-            'store_path' : store_path, 'port' : port, 'user_agent' : user_agent, 'line_notify_token' : line_notify_token}
+            'store_path' : store_path, 'port' : port, 'user_agent' : user_agent, 'line_notify_token' : line_notify_token, \
+            'line_notify_url' : line_notify_url, \
+            'fetch_workers' : fetch_workers, 'max_browsers' : max_browsers, 'driver_pool_size' : driver_pool_size, \
+            'driver_max_pages' : driver_max_pages, 'driver_idle_timeout' : driver_idle_timeout, \
+            'schedule_jitter' : schedule_jitter, 'save_batch_size' : save_batch_size, 'save_flush_interval' : save_flush_interval, \
+            'compact_interval' : compact_interval, 'blob_collect_interval' : blob_collect_interval, 'startup_spread' : startup_spread, \
+            'fetch_mode' : fetch_mode, 'http_timeout' : http_timeout, 'browser_extract' : browser_extract, \
+            'overview_page_size' : overview_page_size, 'preview_page_size' : preview_page_size, 'diff_page_size' : diff_page_size, \
+            'notify_workers' : notify_workers, 'notify_queue_size' : notify_queue_size, 'notify_timeout' : notify_timeout, \
+            'notify_retries' : notify_retries, 'notify_backoff' : notify_backoff, 'smtp_host' : smtp_host, 'smtp_port' : smtp_port, \
+            'smtp_user' : smtp_user, 'smtp_password' : smtp_password, 'smtp_sender' : smtp_sender, \
+            'notify_window' : notify_window, 'notify_rate' : notify_rate, 'notify_burst' : notify_burst, 'metrics_tags' : metrics_tags, \
+            'timing_history' : timing_history, 'rebalance_interval' : rebalance_interval, 'rebalance_threshold' : rebalance_threshold, \
+            'rebalance_moves' : rebalance_moves, 'import_batch_size' : import_batch_size, \
+            'domain_concurrency' : domain_concurrency, 'domain_spacing' : domain_spacing, 'domain_slots' : domain_slots, \
+            'adaptive_factor' : adaptive_factor, 'adaptive_min_interval' : adaptive_min_interval, 'adaptive_max_interval' : adaptive_max_interval, \
+            'fetch_profile' : fetch_profile, 'blocked_urls' : blocked_urls, 'page_load_strategy' : page_load_strategy, \
+            'page_load_timeout' : page_load_timeout, 'wait_timeout' : wait_timeout, 'check_timeout' : check_timeout, \
+            'failure_backoff_max' : failure_backoff_max, 'breaker_threshold' : breaker_threshold, 'breaker_cooldown' : breaker_cooldown, \
+            'supervise_interval' : supervise_interval}
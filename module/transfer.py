@@ -0,0 +1,193 @@
+import io
+import csv
+import json
+import time
+import uuid
+import threading
+from urllib.parse import urlparse
+from module import monitors
+
+FIELDS = ['url', 'title', 'tags', 'interval', 'fetch_mode', 'browser_extract', 'capture_html', 'css_selector', 'ignore_css_selector', \
+          'fetch_profile', 'wait_selector', 'ignore_text', 'notification_emails', 'adaptive', 'min_interval', 'max_interval', 'pause']
+LIST_FIELDS = ['tags', 'ignore_text', 'notification_emails']
+BOOLEAN_FIELDS = ['browser_extract', 'capture_html', 'adaptive', 'pause']
+INTERVAL_FIELDS = ['interval', 'min_interval', 'max_interval']
+FETCH_MODES = ['browser', 'auto', 'http']
+FETCH_PROFILES = ['full', 'light', 'minimal']
+# finished import jobs stay pollable this long
+IMPORT_RETENTION = 3600.0
+
+def detect_format(data):
+    stripped = data.lstrip()
+    if stripped.startswith('[') or stripped.startswith('{'):
+        return 'json'
+    # a header with a url column, in any position, as written by the csv export
+    header = stripped.split('\n', 1)[0]
+    if ',' in header and 'url' in [column.strip().lower() for column in next(csv.reader([header]))]:
+        return 'csv'
+    return 'lines'
+
+def parse_import(data, import_format=None):
+    # rows with at least a url, and the raw entries that could not be used
+    import_format = import_format or detect_format(data)
+    if import_format == 'json':
+        try:
+            entries = json.loads(data)
+        except ValueError:
+            return [], [data]
+        entries = entries if isinstance(entries, list) else [entries]
+        entries = [{'url' : entry} if isinstance(entry, str) else entry for entry in entries]
+    elif import_format == 'csv':
+        entries = list(csv.DictReader(io.StringIO(data)))
+    else:
+        # one url per line, anything after it is taken as tags
+        entries = []
+        for line in data.splitlines():
+            parts = line.split()
+            if parts:
+                entries.append({'url' : parts[0], 'tags' : parts[1 : ]})
+
+    rows, invalid = [], []
+    for entry in entries:
+        row = clean_row(entry) if isinstance(entry, dict) else None
+        if row:
+            rows.append(row)
+        else:
+            invalid.append(entry.get('url', '') if isinstance(entry, dict) else str(entry))
+    return rows, invalid
+
+def clean_row(entry):
+    url = str(entry.get('url') or '').strip()
+    parsed = urlparse(url)
+    if parsed.scheme not in ['http', 'https'] or not parsed.netloc:
+        return None
+
+    row = {'url' : url}
+    for field in LIST_FIELDS:
+        value = entry.get(field)
+        if isinstance(value, str):
+            value = value.split('\n') if field == 'ignore_text' else value.split()
+        if value:
+            row[field] = [str(item).strip() for item in value if str(item).strip()]
+    for field in BOOLEAN_FIELDS:
+        value = entry.get(field)
+        if value not in [None, '']:
+            row[field] = value if isinstance(value, bool) else str(value).lower() in ['1', 'true', 'yes']
+    try:
+        for field in INTERVAL_FIELDS:
+            if entry.get(field) not in [None, '']:
+                row[field] = max(1.0, float(entry[field]))
+    except (TypeError, ValueError):
+        return None
+    if entry.get('fetch_mode') in FETCH_MODES:
+        row['fetch_mode'] = entry['fetch_mode']
+    if entry.get('fetch_profile') in FETCH_PROFILES:
+        row['fetch_profile'] = entry['fetch_profile']
+    for field in ['title', 'css_selector', 'ignore_css_selector', 'wait_selector']:
+        if entry.get(field):
+            row[field] = str(entry[field]).strip()
+    return row
+
+def make_container(config, global_setting, row):
+    web_container = monitors.WebContainer(config, row['url'], row.get('interval', global_setting.default_interval))
+    setting = web_container.setting
+    setting.set_tags(row.get('tags', []))
+    setting.set_fetch_mode(row.get('fetch_mode', setting.fetch_mode), row.get('browser_extract', setting.browser_extract), \
+                           row.get('capture_html', setting.capture_html))
+    setting.set_filters(row.get('css_selector', ''), row.get('ignore_css_selector', ''), row.get('ignore_text', []))
+    setting.set_emails(row.get('notification_emails', []))
+    setting.set_adaptive(row.get('adaptive', False), row.get('min_interval'), row.get('max_interval'))
+    setting.set_fetch_profile(row.get('fetch_profile', ''), row.get('wait_selector', ''), {})
+    setting.pause = row.get('pause', False)
+    if row.get('title'):
+        setting.set_title(row['title'])
+    return web_container
+
+def export_row(web_container):
+    setting = web_container.setting
+    row = {field : getattr(setting, field) for field in FIELDS}
+    row['title'] = '' if setting.url_as_title else setting.title
+    row['id'] = web_container.id
+    return row
+
+def export_csv(web_containers):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, ['id'] + FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    for web_container in web_containers:
+        buffer.seek(0)
+        buffer.truncate()
+        row = export_row(web_container)
+        row['tags'] = ' '.join(row['tags'])
+        row['ignore_text'] = '\n'.join(row['ignore_text'])
+        row['notification_emails'] = ' '.join(row['notification_emails'])
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+def export_json(web_containers):
+    yield '['
+    separator = '\n'
+    for web_container in web_containers:
+        yield separator + json.dumps(export_row(web_container))
+        separator = ',\n'
+    yield '\n]\n'
+
+def start_import(selenium_scheduler, global_setting, rows, invalid):
+    # urls already watched, or repeated in the same import, are left out
+    known_urls = selenium_scheduler.get_urls()
+    web_containers = []
+    ids = set()
+    for row in rows:
+        if row['url'] in known_urls:
+            continue
+        known_urls.add(row['url'])
+        web_container = make_container(selenium_scheduler.config, global_setting, row)
+        # ids come from the clock, a tight loop can hand out the same one twice
+        if web_container.id in ids or selenium_scheduler.index.find(web_container.id) != None:
+            web_container.id = str(time.time()) + uuid.uuid4().hex[ : 8]
+        ids.add(web_container.id)
+        web_containers.append(web_container)
+
+    prune_imports(selenium_scheduler.imports)
+    job = ImportJob(selenium_scheduler, web_containers, len(invalid), len(rows) - len(web_containers), selenium_scheduler.config['import_batch_size'])
+    selenium_scheduler.imports[job.id] = job
+    return job.start()
+
+def prune_imports(imports, time_value=None):
+    time_value = time_value or time.time()
+    for job_id, job in list(imports.items()):
+        if job.end_time != None and job.end_time < time_value - IMPORT_RETENTION:
+            imports.pop(job_id, None)
+
+class ImportJob():
+    # registers an import in batches on its own thread, the web process polls its progress
+    def __init__(self, selenium_scheduler, web_containers, invalid, duplicates, batch_size):
+        self.id = uuid.uuid4().hex
+        self.selenium_scheduler = selenium_scheduler
+        self.web_containers = web_containers
+        self.batch_size = batch_size
+        self.total = len(web_containers)
+        self.registered = 0
+        self.invalid = invalid
+        self.duplicates = duplicates
+        self.start_time = time.time()
+        self.end_time = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def run(self):
+        for start in range(0, self.total, self.batch_size):
+            batch = self.web_containers[start : start + self.batch_size]
+            self.selenium_scheduler.register_many(batch)
+            self.registered += len(batch)
+        self.web_containers = []
+        self.end_time = time.time()
+
+    def stats(self):
+        return {'id' : self.id, 'total' : self.total, 'registered' : self.registered, 'invalid' : self.invalid, \
+                'duplicates' : self.duplicates, 'done' : self.end_time != None, \
+                'elapsed' : (self.end_time or time.time()) - self.start_time}